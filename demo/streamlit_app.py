@@ -5,15 +5,26 @@ Multi-Agent LangGraph Orchestration Interface
 """
 
 import streamlit as st
+import hashlib
+import re
 import sys
 import os
-from typing import Optional
+import threading
+import time
+from typing import TYPE_CHECKING, Optional, Tuple
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+# Add parent directory to path for imports (once per process, not per rerun)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
-from src.orchestrator.workflow import run_workflow
-from src.utils.openai_client import OpenAIClient
+from src.utils.brand_voice_loader import load_brand_voice
+from src.utils.logging_setup import configure_logging
+
+# LangGraph / OpenAI SDK are imported lazily where used, so the page renders
+# without paying their import cost until a script is actually generated
+if TYPE_CHECKING:
+    from src.utils.openai_client import OpenAIClient
 
 
 # =============================================================================
@@ -26,6 +37,83 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Agent progress logs go to the server console via a background writer
+configure_logging()
+
+
+# =============================================================================
+# CACHED RESOURCES
+# =============================================================================
+
+@st.cache_resource(show_spinner=False)
+def get_openai_client(api_key: str) -> "OpenAIClient":
+    """
+    One OpenAIClient per API key across reruns.
+
+    Its sync HTTP connections and RPM/TPM budget are reused by every click;
+    async connections belong to each click's event loop and are closed when
+    that run ends (see `OpenAIClient.run`).
+    """
+    from src.utils.openai_client import OpenAIClient
+
+    return OpenAIClient(api_key=api_key)
+
+
+@st.cache_data(show_spinner=False)
+def get_brand_profile(channel_name: str) -> dict:
+    """Brand voice profile, parsed from disk once per channel"""
+    return load_brand_voice(channel_name)
+
+
+@st.cache_data(show_spinner=False)
+def get_download_payload(topic: str, script: str) -> Tuple[bytes, str]:
+    """Encoded script and file name for the download button, built once per result"""
+    return script.encode('utf-8'), re.sub(r'\s+', '_', topic) + "_script.md"
+
+
+# Demo-mode results are reused for this long (seconds)
+DEMO_RESULT_TTL_S = 3600
+
+
+@st.cache_resource(show_spinner=False)
+def get_demo_results() -> Tuple[dict, threading.Lock]:
+    """
+    Demo-mode workflow results shared by every session, as
+    {key: (stored_at, result)} plus the lock guarding it.
+
+    Only the plain result dict is stored. The run itself happens outside any
+    st.cache_* function, since st.cache_data would record the progress bar
+    and preview updates and replay them into elements of a past click.
+    """
+    return {}, threading.Lock()
+
+
+def demo_result_key(api_key: str, topic: Optional[str], format_type: str, channel_name: str) -> tuple:
+    """Cache key for a demo run; the API key is hashed so a key never sees another key's results"""
+    key_id = hashlib.blake2b(api_key.encode('utf-8'), digest_size=16).hexdigest()
+    return (key_id, topic, format_type, channel_name)
+
+
+def get_demo_result(key: tuple) -> Optional[dict]:
+    """Stored demo-mode result for `key` within DEMO_RESULT_TTL_S, if any"""
+    results, lock = get_demo_results()
+    with lock:
+        entry = results.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > DEMO_RESULT_TTL_S:
+            del results[key]
+            return None
+        return result
+
+
+def store_demo_result(key: tuple, result: dict):
+    """Remember a successful demo-mode result under `key`"""
+    results, lock = get_demo_results()
+    with lock:
+        results[key] = (time.monotonic(), result)
+
 
 # =============================================================================
 # SESSION STATE INITIALIZATION 
@@ -35,6 +123,8 @@ def initialize_session_state():
     """Initialize session state variables for better UX"""
     if 'api_key' not in st.session_state:
         st.session_state['api_key'] = ''
+    if 'api_key_set' not in st.session_state:
+        st.session_state['api_key_set'] = False
     if 'last_result' not in st.session_state:
         st.session_state['last_result'] = None
     if 'channel_name' not in st.session_state:
@@ -51,25 +141,39 @@ initialize_session_state()
 # SIDEBAR CONFIGURATION 
 # =============================================================================
 
-with st.sidebar:
-    st.header("Configuration")
-    
-    # OpenAI API Key Input
+@st.fragment
+def render_api_key_input():
+    """
+    API key input, bound straight to st.session_state['api_key'].
+
+    Runs as a fragment so editing the key doesn't rerun the whole app; a full
+    rerun is only triggered when the key appears or disappears, since the
+    generate button's enabled state depends on it.
+    """
     api_key = st.text_input(
         "OpenAI API Key",
         type="password",
-        value=st.session_state['api_key'],
+        key="api_key",
         help="Enter your OpenAI API key. Get one at https://platform.openai.com/api-keys",
         placeholder="sk-..."
     )
     
-    # Store in session state
     if api_key:
-        st.session_state['api_key'] = api_key
         st.success("API Key provided")
     else:
         st.warning("API Key required")
     
+    if bool(api_key) != st.session_state['api_key_set']:
+        st.session_state['api_key_set'] = bool(api_key)
+        st.rerun()
+
+
+with st.sidebar:
+    st.header("Configuration")
+    
+    # OpenAI API Key Input
+    render_api_key_input()
+    
     st.divider()
     
     # Channel Selector
@@ -157,7 +261,15 @@ col_input, col_output = st.columns([1, 1])
 # INPUT COLUMN 
 # =============================================================================
 
-with col_input:
+@st.fragment
+def render_input_col():
+    """
+    Topic inputs and the generate button.
+
+    Runs as a fragment so switching topic mode or typing a topic only reruns
+    this column. Clicking the button requests a full app rerun, which picks
+    the request up in the workflow execution section below.
+    """
     st.header("Input")
     
     # Topic Selection Radio
@@ -165,35 +277,47 @@ with col_input:
         "Topic Selection",
         options=["Auto-Discover Trending Topic", "Manual Topic Input"],
         index=0,
+        key="topic_mode",
         help="Choose how to select the topic"
     )
     
     # Show info for auto-discover
     if topic_mode == "Auto-Discover Trending Topic":
         st.info("Will scrape HackerNews for trending tech topics")
-        topic = None
     else:
         # Manual topic input
-        topic = st.text_input(
+        st.text_input(
             "Enter Topic",
             placeholder="e.g., React 19 Server Components",
+            key="topic",
             help="Provide a specific topic to research and write about"
         )
     
     st.markdown("---")
     
     # Generate Script Button
-    generate_button = st.button(
+    if st.button(
         "Generate Script",
         type="primary",
         use_container_width=True,
         disabled=not st.session_state['api_key']
-    )
+    ):
+        st.session_state['generate_requested'] = True
+        st.rerun()
     
     if not st.session_state['api_key']:
         st.error("Please provide an API key in the sidebar")
 
 
+with col_input:
+    render_input_col()
+
+# Inputs captured by the fragment above
+topic_mode = st.session_state['topic_mode']
+topic = st.session_state.get('topic') if topic_mode == "Manual Topic Input" else None
+generate_button = st.session_state.pop('generate_requested', False)
+
+
 # =============================================================================
 # OUTPUT COLUMN 
 # =============================================================================
@@ -228,39 +352,63 @@ if generate_button:
         
         # Create progress tracking
         progress_bar = st.progress(0, text="Initializing...")
-        status_text = st.empty()
+        
+        def update_progress(stage: str, fraction: float):
+            """Advance the bar as each workflow node finishes"""
+            progress_bar.progress(int(fraction * 100), text=stage)
         
         try:
-            # Initialize OpenAI client with user's API key
-            client = OpenAIClient(api_key=st.session_state['api_key'])
-            
-            # Progress updates
-            progress_bar.progress(10, text="Initializing OpenAI client...")
+            # Reuse the cached OpenAI client for this API key
+            client = get_openai_client(st.session_state['api_key'])
+
+            # Fail fast on a missing/invalid brand voice config
+            get_brand_profile(st.session_state['channel_name'])
             
-            # Execute workflow with progress updates
-            with st.spinner("Running multi-agent workflow..."):
-                # Update progress for Scout stage
-                progress_bar.progress(25, text="Scout Agent: Researching topic...")
-                status_text.text("Phase 1/3: Research")
-                
-                # Start workflow (this will take time)
-                result = run_workflow(
+            progress_bar.progress(0, text="Scout Agent: Researching topic...")
+
+            # Live preview of the writer's tokens while the workflow runs
+            stream_preview = st.empty()
+
+            # Demo mode reads the same cached HackerNews data every time, so a
+            # repeat click reuses the earlier result instead of re-running every agent
+            result = None
+            demo_key = None
+            if st.session_state['demo_mode']:
+                demo_key = demo_result_key(
+                    st.session_state['api_key'],
+                    topic,
+                    st.session_state['format_type'],
+                    st.session_state['channel_name']
+                )
+                result = get_demo_result(demo_key)
+
+            # Start workflow (this will take time)
+            if result is None:
+                from src.orchestrator.workflow import run_workflow_async
+
+                result = client.run(run_workflow_async(
                     topic=topic,
                     format_type=st.session_state['format_type'],
                     channel_name=st.session_state['channel_name'],
                     demo_mode=st.session_state['demo_mode'],
-                    openai_client=client
-                )
-                
-                # Update progress for completion
-                progress_bar.progress(100, text="Workflow complete!")
+                    openai_client=client,
+                    streaming_callback=stream_preview.markdown,
+                    progress_callback=update_progress
+                ))
+
+                # Only successful runs are kept, so a failed one is retried next click
+                if demo_key is not None and result.get('final_script'):
+                    store_demo_result(demo_key, result)
+
+            # Update progress for completion
+            progress_bar.progress(100, text="Workflow complete!")
             
             # Store result in session state
             st.session_state['last_result'] = result
             
-            # Clear progress indicators
+            # Clear progress indicators (final script renders in the results section)
             progress_bar.empty()
-            status_text.empty()
+            stream_preview.empty()
             
             # Success message
             st.success(
@@ -299,115 +447,127 @@ if generate_button:
 # RESULTS DISPLAY 
 # =============================================================================
 
-# Display results if available in session state
-if st.session_state['last_result']:
-    result = st.session_state['last_result']
+@st.fragment
+def render_results(result: dict):
+    """
+    Execution summary, scores, feedback and final script for a workflow result.
+
+    Runs as a fragment so interactions inside it (e.g. the download button)
+    don't rerun the rest of the app.
+    """
+    st.markdown("---")
     
-    with results_container:
-        st.markdown("---")
-        
-        # Success Banner (already shown above in workflow execution)
-        
-        # Metadata Metrics
-        st.subheader("Execution Summary")
-        
-        metric_col1, metric_col2, metric_col3 = st.columns(3)
-        
-        with metric_col1:
-            st.metric("Topic", result.get('topic', 'N/A'))
-        
-        with metric_col2:
-            st.metric("Format", result.get('format_type', 'N/A'))
-        
-        with metric_col3:
-            st.metric("Iterations", result.get('iteration', 0))
+    # Success Banner (already shown above in workflow execution)
+    
+    # Metadata Metrics
+    st.subheader("Execution Summary")
+    
+    metric_col1, metric_col2, metric_col3 = st.columns(3)
+    
+    with metric_col1:
+        st.metric("Topic", result.get('topic', 'N/A'))
+    
+    with metric_col2:
+        st.metric("Format", result.get('format_type', 'N/A'))
+    
+    with metric_col3:
+        st.metric("Iterations", result.get('iteration', 0))
+    
+    st.markdown("---")
+    
+    # Validation Scores
+    st.subheader("Validation Scores")
+    
+    score_col1, score_col2, score_col3 = st.columns(3)
+    
+    with score_col1:
+        st.metric(
+            "Heuristic Score",
+            f"{result.get('heuristic_score', 0)}/100"
+        )
+    
+    with score_col2:
+        llm_score = result.get('llm_score')
+        st.metric(
+            "LLM Score",
+            f"{llm_score}/100" if llm_score is not None else "Skipped"
+        )
+    
+    with score_col3:
+        final_score = result.get('brand_score', 0)
+        st.metric(
+            "Final Score",
+            f"{final_score}/100",
+            delta="PASSED" if final_score >= 75 else "NEEDS IMPROVEMENT"
+        )
+    
+    st.markdown("---")
+    
+    # Validation Feedback
+    st.subheader("Validation Feedback")
+    
+    feedback_col1, feedback_col2, feedback_col3 = st.columns(3)
+    
+    with feedback_col1:
+        if result.get('validation_strengths'):
+            st.markdown("**Strengths:**\n\n" + "\n".join(f"- {strength}" for strength in result['validation_strengths']))
+        else:
+            st.info("No strengths data available")
+    
+    with feedback_col2:
+        if result.get('validation_weaknesses'):
+            st.markdown("**Weaknesses:**\n\n" + "\n".join(f"- {weakness}" for weakness in result['validation_weaknesses']))
+        else:
+            st.info("No weaknesses data available")
+    
+    with feedback_col3:
+        if result.get('validation_suggestions'):
+            st.markdown("**Suggestions:**\n\n" + "\n".join(f"- {suggestion}" for suggestion in result['validation_suggestions']))
+        else:
+            st.info("No suggestions available")
+    
+    st.markdown("---")
+    
+    # Final Script
+    st.subheader("Final Script")
+    
+    if result.get('final_script'):
+        # Display script in markdown
+        st.markdown(result['final_script'])
         
         st.markdown("---")
         
-        # Validation Scores
-        st.subheader("Validation Scores")
-        
-        score_col1, score_col2, score_col3 = st.columns(3)
-        
-        with score_col1:
-            st.metric(
-                "Heuristic Score",
-                f"{result.get('heuristic_score', 0)}/100"
-            )
-        
-        with score_col2:
-            st.metric(
-                "LLM Score",
-                f"{result.get('llm_score', 0)}/100"
-            )
-        
-        with score_col3:
-            final_score = result.get('brand_score', 0)
-            st.metric(
-                "Final Score",
-                f"{final_score}/100",
-                delta="PASSED" if final_score >= 75 else "NEEDS IMPROVEMENT"
-            )
-        
+        #  Download Button
+        data, file_name = get_download_payload(result.get('topic') or 'script', result['final_script'])
+        st.download_button(
+            label="Download Script (.md)",
+            data=data,
+            file_name=file_name,
+            mime="text/markdown",
+            use_container_width=True
+        )
+    else:
+        st.warning("No script generated")
+    
+    # Show errors if any (agent timeouts get their own expander)
+    timeouts = [e for e in result.get('errors', []) if e.startswith("agent_timeout")]
+    errors = [e for e in result.get('errors', []) if not e.startswith("agent_timeout")]
+
+    if timeouts:
         st.markdown("---")
-        
-        # Validation Feedback
-        st.subheader("Validation Feedback")
-        
-        feedback_col1, feedback_col2, feedback_col3 = st.columns(3)
-        
-        with feedback_col1:
-            if result.get('validation_strengths'):
-                st.markdown("**Strengths:**")
-                for strength in result['validation_strengths']:
-                    st.markdown(f"- {strength}")
-            else:
-                st.info("No strengths data available")
-        
-        with feedback_col2:
-            if result.get('validation_weaknesses'):
-                st.markdown("**Weaknesses:**")
-                for weakness in result['validation_weaknesses']:
-                    st.markdown(f"- {weakness}")
-            else:
-                st.info("No weaknesses data available")
-        
-        with feedback_col3:
-            if result.get('validation_suggestions'):
-                st.markdown("**Suggestions:**")
-                for suggestion in result['validation_suggestions']:
-                    st.markdown(f"- {suggestion}")
-            else:
-                st.info("No suggestions available")
-        
+        with st.expander(f"Agent timeouts ({len(timeouts)})"):
+            st.markdown("\n".join(f"- {timeout}" for timeout in timeouts))
+
+    if errors:
         st.markdown("---")
-        
-        # Final Script
-        st.subheader("Final Script")
-        
-        if result.get('final_script'):
-            # Display script in markdown
-            st.markdown(result['final_script'])
-            
-            st.markdown("---")
-            
-            #  Download Button
-            st.download_button(
-                label="Download Script (.md)",
-                data=result['final_script'],
-                file_name=f"{result.get('topic', 'script').replace(' ', '_')}_script.md",
-                mime="text/markdown",
-                use_container_width=True
-            )
-        else:
-            st.warning("No script generated")
-        
-        # Show errors if any
-        if result.get('errors'):
-            st.markdown("---")
-            st.error("Errors encountered during execution:")
-            for error in result['errors']:
-                st.markdown(f"- {error}")
+        st.error("Errors encountered during execution:")
+        st.markdown("\n".join(f"- {error}" for error in errors))
+
+
+# Display results if available in session state
+if st.session_state['last_result']:
+    with results_container:
+        render_results(st.session_state['last_result'])
 
 
 # =============================================================================
@@ -20,11 +20,12 @@ import argparse
 import io
 from dotenv import load_dotenv
 
-# Fix encoding for Windows
+# Fix encoding for Windows (reconfigure in place rather than wrapping every write)
 if sys.platform == "win32":
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+    sys.stdout.reconfigure(encoding='utf-8')
+    sys.stderr.reconfigure(encoding='utf-8')
 from src.orchestrator.workflow import run_workflow
+from src.utils.logging_setup import configure_logging
 from src.utils.openai_client import OpenAIClient
 
 # Load environment variables from .env
@@ -67,6 +68,9 @@ def main():
     )
     
     args = parser.parse_args()
+
+    # Show agent progress; written inline so it stays in order with the results
+    configure_logging(use_queue=False)
     
     # Interactive mode if no arguments
     if len(sys.argv) == 1:
@@ -163,14 +167,18 @@ def interactive_mode():
 def cli_mode(args):
     """Run workflow with CLI arguments"""
     
-    print("\n" + "=" * 70)
-    print("ELECTRIFY - AI YouTube Script Generator")
-    print("=" * 70)
-    print(f"Channel: {args.channel}")
-    print(f"Topic: {args.topic or 'Auto-discover'}")
-    print(f"Format: {args.format}")
-    print(f"Demo Mode: {args.demo}")
-    print("=" * 70 + "\n")
+    sys.stdout.write("\n".join([
+        "",
+        "=" * 70,
+        "ELECTRIFY - AI YouTube Script Generator",
+        "=" * 70,
+        f"Channel: {args.channel}",
+        f"Topic: {args.topic or 'Auto-discover'}",
+        f"Format: {args.format}",
+        f"Demo Mode: {args.demo}",
+        "=" * 70 + "\n\n"
+    ]))
+    sys.stdout.flush()
     
     try:
         client = OpenAIClient()
@@ -193,60 +201,65 @@ def cli_mode(args):
 
 
 def print_results(result):
-    """Print formatted workflow results"""
+    """Print formatted workflow results (buffered into a single write)"""
+    buf = io.StringIO()
     
-    print("\n" + "=" * 70)
-    print("WORKFLOW RESULTS")
-    print("=" * 70)
+    print("\n" + "=" * 70, file=buf)
+    print("WORKFLOW RESULTS", file=buf)
+    print("=" * 70, file=buf)
     
-    print(f"\n Execution Summary")
-    print(f"  Topic: {result.get('topic', 'N/A')}")
-    print(f"  Format: {result.get('format_type', 'N/A')}")
-    print(f"  Execution Mode: {result.get('execution_mode', 'N/A')}")
-    print(f"  Refinement Iterations: {result.get('iteration', 0)}")
+    print(f"\n Execution Summary", file=buf)
+    print(f"  Topic: {result.get('topic', 'N/A')}", file=buf)
+    print(f"  Format: {result.get('format_type', 'N/A')}", file=buf)
+    print(f"  Execution Mode: {result.get('execution_mode', 'N/A')}", file=buf)
+    print(f"  Refinement Iterations: {result.get('iteration', 0)}", file=buf)
     
-    print(f"\n Validation Scores")
-    print(f"  Final Score: {result.get('brand_score', 0)}/100")
-    print(f"  Heuristic Score: {result.get('heuristic_score', 0)}/100")
-    print(f"  LLM Score: {result.get('llm_score', 0)}/100")
+    print(f"\n Validation Scores", file=buf)
+    print(f"  Final Score: {result.get('brand_score', 0)}/100", file=buf)
+    print(f"  Heuristic Score: {result.get('heuristic_score', 0)}/100", file=buf)
+    llm_score = result.get('llm_score')
+    print(f"  LLM Score: {f'{llm_score}/100' if llm_score is not None else 'skipped'}", file=buf)
     
     if result.get('brand_score', 0) >= 75:
-        print(f"  Status: PASSED (score >= 75)")
+        print(f"  Status: PASSED (score >= 75)", file=buf)
     else:
-        print(f"  Status: NEEDS IMPROVEMENT (score < 75)")
+        print(f"  Status: NEEDS IMPROVEMENT (score < 75)", file=buf)
     
     # Show validation feedback
     if result.get('validation_strengths'):
-        print(f"\n Strengths:")
+        print(f"\n Strengths:", file=buf)
         for strength in result['validation_strengths']:
-            print(f"  • {strength}")
+            print(f"  • {strength}", file=buf)
     
     if result.get('validation_weaknesses'):
-        print(f"\n  Weaknesses:")
+        print(f"\n  Weaknesses:", file=buf)
         for weakness in result['validation_weaknesses']:
-            print(f"  • {weakness}")
+            print(f"  • {weakness}", file=buf)
     
     if result.get('validation_suggestions'):
-        print(f"\n Suggestions:")
+        print(f"\n Suggestions:", file=buf)
         for suggestion in result['validation_suggestions']:
-            print(f"  • {suggestion}")
+            print(f"  • {suggestion}", file=buf)
     
     # Show final script
     if result.get('final_script'):
-        print(f"\n Final Script")
-        print("=" * 70)
-        print(result['final_script'])
-        print("=" * 70)
+        print(f"\n Final Script", file=buf)
+        print("=" * 70, file=buf)
+        print(result['final_script'], file=buf)
+        print("=" * 70, file=buf)
     
     # Show errors if any
     if result.get('errors'):
-        print(f"\n Errors:")
+        print(f"\n Errors:", file=buf)
         for error in result['errors']:
-            print(f"  • {error}")
+            print(f"  • {error}", file=buf)
     
-    print("\n" + "=" * 70)
-    print(" Workflow Complete!")
-    print("=" * 70 + "\n")
+    print("\n" + "=" * 70, file=buf)
+    print(" Workflow Complete!", file=buf)
+    print("=" * 70 + "\n", file=buf)
+    
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
@@ -1,11 +1,54 @@
-from typing import Dict, List
+from functools import lru_cache
+from inspect import cleandoc
+from typing import Dict, List, Optional, Tuple
 from src.utils.openai_client import OpenAIClient
 from pydantic import BaseModel
-import json
+import asyncio
+import orjson
+import os
+
+
+# Brand profile fields that describe voice; metadata (creator, subscribers,
+# visual style, ...) doesn't help score a script and only costs prompt tokens
+VOICE_PROFILE_FIELDS = (
+    "tone",
+    "formality_level",
+    "humor_frequency",
+    "humor_types",
+    "pacing",
+    "sentence_structure",
+    "signature_phrases",
+    "avoid",
+    "cta_style",
+)
+
+
+# Longest script (in characters) sent to the LLM check; longer scripts keep
+# their head and tail. Sized above a full code_report script (~4-5 min) so
+# only runaway outputs are trimmed
+MAX_SCRIPT_CHARS = 12000
+TRUNCATION_MARKER = "\n...[truncated]...\n"
+
+# Heuristic score at or above which the LLM check is skipped: the combined
+# score can't fall under the refinement threshold unless the LLM scores the
+# script below 65, which rarely happens for drafts that strong
+SKIP_LLM_ABOVE = int(os.getenv("VALIDATOR_SKIP_LLM_ABOVE", "90"))
+
+
+@lru_cache(maxsize=32)
+def _fold_phrases(phrases: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Case-folded phrase list, shared by every validator built from the same profile"""
+    return tuple(p.casefold() for p in phrases)
 
 
 class BrandScoreResponse(BaseModel):
-    """Pydantic model for brand voice validation"""
+    """
+    Pydantic model for brand voice validation.
+
+    Kept as a pydantic model (rather than e.g. msgspec.Struct): the strict
+    JSON schema is derived from it, and responses are built with
+    `model_construct` since the API already enforces that schema.
+    """
     score: int  # 0-100
     reasoning: str
     strengths: List[str]
@@ -13,6 +56,11 @@ class BrandScoreResponse(BaseModel):
     suggestions: List[str]
 
 
+class BrandScoreBatchResponse(BaseModel):
+    """Pydantic model for validating several scripts in one call (one item per script, in order)"""
+    items: List[BrandScoreResponse]
+
+
 class BrandVoiceAgent:
     """
     Flexible brand voice validator for any YouTube channel.
@@ -39,19 +87,101 @@ class BrandVoiceAgent:
         self.brand_voice = brand_voice
         self.channel_name = channel_name
 
-    def validate_script(self, script: str) -> Dict:
+        # Brand profile doesn't change per call, so render the system prompt once
+        self.system_prompt = self._create_system_prompt()
+
+        # Routes every validation for this channel to the same OpenAI prompt cache
+        self.prompt_cache_key = f"validator:{channel_name}"
+
+        # Case-folded once per profile instead of on every heuristic check
+        self._signature_phrases = _fold_phrases(tuple(brand_voice.get('signature_phrases', [])))
+        self._avoid_terms = _fold_phrases(tuple(brand_voice.get('avoid', [])))
+
+    def validate_script(self, script: str, allow_heuristic_only: bool = True) -> Dict:
         """
         Score script against brand voice with GUARANTEED structure.
 
+        Args:
+            script: Script to score
+            allow_heuristic_only: Skip the LLM check when the heuristic score
+                reaches SKIP_LLM_ABOVE. Pass False when ranking several
+                scripts, so every score is on the same blended scale.
+
         Returns:
-            Dict with: score, heuristic_score, llm_score, reasoning, strengths, weaknesses, suggestions
+            Dict with: score, heuristic_score, llm_score (None if the LLM
+            check was skipped), reasoning, strengths, weaknesses, suggestions
         """
         # Quick heuristic checks
         heuristic_score = self._heuristic_check(script)
+        if allow_heuristic_only and heuristic_score >= SKIP_LLM_ABOVE:
+            return self._heuristic_only(script, heuristic_score)
 
         # LLM-based semantic check with structured output
         semantic_result = self._semantic_check_structured(script)
 
+        return self._combine_scores(heuristic_score, semantic_result)
+
+    async def validate_script_async(
+        self,
+        script: str,
+        model: Optional[str] = None,
+        allow_heuristic_only: bool = True
+    ) -> Dict:
+        """
+        Async variant of `validate_script`.
+
+        The heuristic runs first (well under a millisecond) so a strong draft
+        can skip the LLM round-trip entirely.
+
+        Args:
+            script: Script to score
+            model: Override the validator model for the LLM check
+            allow_heuristic_only: As in `validate_script`
+        """
+        heuristic_score = self._heuristic_check(script)
+        if allow_heuristic_only and heuristic_score >= SKIP_LLM_ABOVE:
+            return self._heuristic_only(script, heuristic_score)
+
+        semantic_result = await self._semantic_check_structured_async(script, model=model)
+
+        return self._combine_scores(heuristic_score, semantic_result)
+
+    def validate_scripts(self, scripts: List[str]) -> List[Dict]:
+        """
+        Score several scripts with a single LLM request.
+
+        Trades latency for cost: one structured response covers every script,
+        so the brand profile prompt is sent once instead of per script, but the
+        model writes all the reviews sequentially. Prefer parallel
+        `validate_script_async` calls when latency matters.
+
+        Returns:
+            One validation dict (see `validate_script`) per script, in order
+        """
+        heuristic_scores = [self._heuristic_check(script) for script in scripts]
+        semantic_results = self._semantic_check_batch(scripts)
+
+        return [
+            self._combine_scores(heuristic, semantic)
+            for heuristic, semantic in zip(heuristic_scores, semantic_results)
+        ]
+
+    async def validate_scripts_async(self, scripts: List[str], model: Optional[str] = None) -> List[Dict]:
+        """
+        Async variant of `validate_scripts`.
+        """
+        heuristic_scores, semantic_results = await asyncio.gather(
+            asyncio.to_thread(lambda: [self._heuristic_check(script) for script in scripts]),
+            self._semantic_check_batch_async(scripts, model=model)
+        )
+
+        return [
+            self._combine_scores(heuristic, semantic)
+            for heuristic, semantic in zip(heuristic_scores, semantic_results)
+        ]
+
+    def _combine_scores(self, heuristic_score: int, semantic_result: BrandScoreResponse) -> Dict:
+        """Combine heuristic and LLM results into the validation dict"""
         # Combine scores: 40% heuristic + 60% LLM
         final_score = int(0.4 * heuristic_score + 0.6 * semantic_result.score)
 
@@ -65,6 +195,38 @@ class BrandVoiceAgent:
             "suggestions": semantic_result.suggestions
         }
 
+    def _heuristic_only(self, script: str, heuristic_score: int) -> Dict:
+        """Validation dict for a script accepted on its heuristic score alone"""
+        return {
+            "score": heuristic_score,
+            "heuristic_score": heuristic_score,
+            "llm_score": None,
+            "reasoning": f"Heuristic-only (score {heuristic_score} >= {SKIP_LLM_ABOVE}, LLM check skipped)",
+            "strengths": self._heuristic_strengths(script),
+            "weaknesses": [],
+            "suggestions": []
+        }
+
+    def _heuristic_strengths(self, script: str) -> List[str]:
+        """What the heuristic rewarded, so a heuristic-only review isn't empty"""
+        strengths = []
+
+        num_sentences = sum(1 for s in script.split('.') if s and not s.isspace())
+        if num_sentences:
+            avg_length = len(script.replace('.', ' ').split()) / num_sentences
+            if avg_length < 15:
+                strengths.append(f"Short, punchy sentences (~{avg_length:.0f} words on average)")
+
+        script_lower = script.casefold()
+        found_phrases = [phrase for phrase in self._signature_phrases if phrase in script_lower]
+        if found_phrases:
+            strengths.append(f"Uses {len(found_phrases)} signature phrase(s): {', '.join(found_phrases[:3])}")
+
+        if not any(bad in script_lower for bad in self._avoid_terms):
+            strengths.append("Avoids every term on the brand's avoid list")
+
+        return strengths
+
     def _heuristic_check(self, script: str) -> int:
         """
         Fast pattern matching for brand voice characteristics.
@@ -76,29 +238,29 @@ class BrandVoiceAgent:
         """
         score = 70  # Base score
 
-        # Check sentence length (should be short for fast-paced channels)
-        sentences = [s.strip() for s in script.split('.') if s.strip()]
-        if not sentences:
+        # Check sentence length (should be short for fast-paced channels).
+        # Count non-blank '.'-separated sentences and words without building
+        # stripped copies or splitting each sentence again; words never span a
+        # '.', so splitting with '.' treated as whitespace gives the same total
+        num_sentences = sum(1 for s in script.split('.') if s and not s.isspace())
+        if not num_sentences:
             return score
 
-        avg_length = sum(len(s.split()) for s in sentences) / len(sentences)
+        avg_length = len(script.replace('.', ' ').split()) / num_sentences
         if avg_length < 15:
             score += 10
         elif avg_length > 25:
             score -= 10
 
+        # Folded the same way as the phrase lists (casefold also matches e.g. "ß"/"ss")
+        script_lower = script.casefold()
+
         # Check for signature phrases (bonus: +5 per phrase, max +15)
-        found_phrases = sum(
-            1 for phrase in self.brand_voice.get('signature_phrases', [])
-            if phrase.lower() in script.lower()
-        )
+        found_phrases = sum(1 for phrase in self._signature_phrases if phrase in script_lower)
         score += min(found_phrases * 5, 15)
 
         # Check for avoided terms (penalty: -5 per term)
-        found_bad = sum(
-            1 for bad in self.brand_voice.get('avoid', [])
-            if bad.lower() in script.lower()
-        )
+        found_bad = sum(1 for bad in self._avoid_terms if bad in script_lower)
         score -= found_bad * 5
 
         return max(0, min(100, score))
@@ -107,13 +269,96 @@ class BrandVoiceAgent:
         """
         LLM-based brand voice matching with STRUCTURED OUTPUT.
         """
-        # Build system prompt that's channel-agnostic
-        system_prompt = f"""You are a brand voice expert analyzing YouTube scripts.
+        system_prompt, user_message = self._build_semantic_prompts(script)
+
+        # Use structured outputs - guaranteed parsing, no regex
+        response = self.client.call_agent_structured(
+            agent_type="validator",
+            system_prompt=system_prompt,
+            user_message=user_message,
+            response_format=BrandScoreResponse,
+            prompt_cache_key=self.prompt_cache_key
+        )
+
+        return response
+
+    async def _semantic_check_structured_async(self, script: str, model: Optional[str] = None) -> BrandScoreResponse:
+        """
+        Async variant of `_semantic_check_structured`.
+        """
+        system_prompt, user_message = self._build_semantic_prompts(script)
+
+        return await self.client.acall_agent_structured(
+            agent_type="validator",
+            system_prompt=system_prompt,
+            user_message=user_message,
+            response_format=BrandScoreResponse,
+            model=model,
+            prompt_cache_key=self.prompt_cache_key
+        )
+
+    def _semantic_check_batch(self, scripts: List[str]) -> List[BrandScoreResponse]:
+        """
+        LLM-based brand voice matching for several scripts in one structured call.
+        """
+        response = self.client.call_agent_structured(
+            agent_type="validator",
+            system_prompt=self.system_prompt,
+            user_message=self._build_batch_message(scripts),
+            response_format=BrandScoreBatchResponse,
+            prompt_cache_key=self.prompt_cache_key
+        )
+
+        return self._check_batch_size(response, scripts)
+
+    async def _semantic_check_batch_async(self, scripts: List[str], model: Optional[str] = None) -> List[BrandScoreResponse]:
+        """
+        Async variant of `_semantic_check_batch`.
+        """
+        response = await self.client.acall_agent_structured(
+            agent_type="validator",
+            system_prompt=self.system_prompt,
+            user_message=self._build_batch_message(scripts),
+            response_format=BrandScoreBatchResponse,
+            model=model,
+            prompt_cache_key=self.prompt_cache_key
+        )
+
+        return self._check_batch_size(response, scripts)
+
+    def _check_batch_size(self, response: BrandScoreBatchResponse, scripts: List[str]) -> List[BrandScoreResponse]:
+        """Ensure the batch response has exactly one item per script"""
+        if len(response.items) != len(scripts):
+            raise ValueError(
+                f"Expected {len(scripts)} validation results, got {len(response.items)}"
+            )
+        return response.items
+
+    def _build_batch_message(self, scripts: List[str]) -> str:
+        """Number each script so the model returns one result per script, in order"""
+        numbered = "\n\n".join(
+            f"--- SCRIPT {i + 1} ---\n{self._truncate_script(script)}" for i, script in enumerate(scripts)
+        )
+
+        return (
+            f"Analyze each of these {len(scripts)} scripts for {self.channel_name} brand voice consistency.\n\n"
+            f"Return exactly {len(scripts)} items, one per script, in the same order.\n\n"
+            f"{numbered}"
+        )
+
+    def _create_system_prompt(self) -> str:
+        """
+        Create the channel-agnostic system prompt for the LLM brand voice check.
+
+        Returns:
+            System prompt embedding the channel's brand profile
+        """
+        return cleandoc(f"""You are a brand voice expert analyzing YouTube scripts.
 
         Analyzing script for: {self.channel_name}
 
         Channel characteristics:
-        {json.dumps(self.brand_voice, indent=2)}
+        {self._compact_profile()}
 
         Analyze the script and provide:
         1. A score (0-100) for how well it matches {self.channel_name}'s style
@@ -122,20 +367,61 @@ class BrandVoiceAgent:
         4. Specific weaknesses (what doesn't match)
         5. Actionable suggestions for improvement
 
-        Be precise and honest in your assessment."""
+        Be precise and honest in your assessment.""")
 
-        user_message = f"""Analyze this script for {self.channel_name} brand voice consistency:
+    @staticmethod
+    def _truncate_script(script: str) -> str:
+        """
+        Cap a script at MAX_SCRIPT_CHARS for the LLM prompt.
 
-        {script}
+        Keeps the head (hook, setup) and tail (conclusion, CTA) so the model
+        still sees the script's structure; the heuristic check always scores
+        the full script.
+        """
+        if len(script) <= MAX_SCRIPT_CHARS:
+            return script
+        half = (MAX_SCRIPT_CHARS - len(TRUNCATION_MARKER)) // 2
+        return script[:half] + TRUNCATION_MARKER + script[-half:]
 
-        Provide detailed feedback."""
+    def _compact_profile(self) -> str:
+        """Voice-relevant brand profile fields as compact JSON for the system prompt"""
+        profile = {k: self.brand_voice[k] for k in VOICE_PROFILE_FIELDS if k in self.brand_voice}
+        return orjson.dumps(profile).decode()
 
-        # Use structured outputs - guaranteed parsing, no regex
-        response = self.client.call_agent_structured(
-            agent_type="validator",
-            system_prompt=system_prompt,
-            user_message=user_message,
-            response_format=BrandScoreResponse
+    def _build_semantic_prompts(self, script: str) -> Tuple[str, str]:
+        """
+        Build (system_prompt, user_message) for the LLM brand voice check.
+        """
+        user_message = (
+            f"Analyze this script for {self.channel_name} brand voice consistency:\n\n"
+            f"{self._truncate_script(script)}\n\n"
+            "Provide detailed feedback."
         )
 
-        return response
+        return self.system_prompt, user_message
+
+
+async def validate_across_channels(
+    script: str,
+    validators: List[BrandVoiceAgent],
+    model: Optional[str] = None
+) -> Dict[str, Dict]:
+    """
+    Score one script against several channels' brand voices concurrently.
+
+    Each validator's heuristic + LLM check runs in parallel with the others,
+    so the total cost is ~one validator round-trip (subject to rate limits).
+
+    Args:
+        script: Script to score
+        validators: One BrandVoiceAgent per channel
+        model: Override the validator model for the LLM checks
+
+    Returns:
+        Validation dict (see `BrandVoiceAgent.validate_script`) per channel name
+    """
+    results = await asyncio.gather(*[
+        validator.validate_script_async(script, model=model)
+        for validator in validators
+    ])
+    return {validator.channel_name: result for validator, result in zip(validators, results)}
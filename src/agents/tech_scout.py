@@ -8,13 +8,29 @@ Capabilities:
 - Comprehensive demo mode with fallback system
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from src.utils.openai_client import OpenAIClient
 from src.utils.hn_scraper import get_trending_hn
-from src.utils.brand_voice_loader import load_brand_voice
-import json
+from src.utils.brand_voice_loader import load_brand_voice, summarize_brand_voice
+from inspect import cleandoc
+import asyncio
+import logging
+import orjson
 import os
-import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+_TOPIC_SELECTOR_PROMPT = "You are a topic selector for Fireship. Pick topics that align with sarcastic humor, developer pain points, and tech culture."
+
+# Parsed cached-trends file keyed by (path, mtime), shared across scout instances
+_CACHED_TRENDS: Dict[tuple, List[Dict]] = {}
+
+# Topic picks keyed by (channel, trending story ids) -> (picked_at, topic), so
+# repeat runs over the same trending list skip the selection call
+SELECTION_CACHE_TTL_S = 900
+_SELECTION_CACHE: Dict[tuple, Tuple[float, str]] = {}
 
 
 class TechScoutAgent:
@@ -37,7 +53,7 @@ class TechScoutAgent:
         try:
             self.brand_voice = load_brand_voice(channel_name)
         except (FileNotFoundError, ValueError):
-            print(f"WARNING: Brand voice config not found for {channel_name}, using generic mode")
+            log.warning("WARNING: Brand voice config not found for %s, using generic mode", channel_name)
             self.brand_voice = None
 
         # System prompt uses brand voice profile (or generic if not available)
@@ -54,17 +70,15 @@ class TechScoutAgent:
             System prompt for tech scouting, customized to Fireship's voice
         """
         # Extract brand voice characteristics for Fireship
-        tone = ", ".join(brand_voice.get("tone", ["sarcastic", "deadpan"])) if brand_voice else "sarcastic, deadpan"
-        humor_types = ", ".join(brand_voice.get("humor_types", []) if brand_voice else ["programming memes", "tech culture references"])
-        signature_phrases = ", ".join(brand_voice.get("signature_phrases", [])[:3] if brand_voice else ["like and subscribe", "it's actually pretty simple"])
+        voice = summarize_brand_voice(brand_voice)
 
-        return f"""You are a tech trend scout for Fireship,
+        return cleandoc(f"""You are a tech trend scout for Fireship,
         a fast-paced programming YouTube channel. Your job is to find
         interesting, meme-worthy tech topics that programmers will love.
 
-        Brand Voice: {tone}
-        Humor Style: {humor_types}
-        Signature Phrases: {signature_phrases}
+        Brand Voice: {voice.tone}
+        Humor Style: {voice.humor_types}
+        Signature Phrases: {voice.signature_phrases}
 
         Prioritize:
         - Breaking news (new framework releases, tech drama, AI breakthroughs)
@@ -78,7 +92,7 @@ class TechScoutAgent:
         3. Key talking points (3-5 bullet points)
         4. Meme potential (1-10 score)
         5. Suggested angle (hot take or educational)
-        6. Relevant code examples or tools mentioned"""
+        6. Relevant code examples or tools mentioned""")
 
     def research_topic(self, topic: Optional[str] = None) -> Dict:
         """
@@ -103,24 +117,16 @@ class TechScoutAgent:
 
         # Auto-discover trending topic if not provided
         if not topic:
-            print(f"[SCOUT] Auto-discovering trending topics for {self.channel_name}...")
+            log.info("[SCOUT] Auto-discovering trending topics for %s...", self.channel_name)
             trending = self._get_trending_safe()
             if self.demo_mode or isinstance(trending, list) and len(trending) > 0:
                 mode = "cached" if self.demo_mode else "live"
             topic = self._select_best_topic(trending)
-            print(f"[SCOUT] Selected topic: {topic}")
+            log.info("[SCOUT] Selected topic: %s", topic)
 
         # Research the topic using OpenAI
-        print(f"[SCOUT] Researching '{topic}'...")
-        user_message = f"""Research this topic for a {self.channel_name} video: {topic}
-
-        Provide:
-        - Core concept explanation (what is this?)
-        - Why developers should care
-        - Controversial or funny angles
-        - Key technical details
-        - Meme opportunities or visual ideas
-        - Similar or related topics"""
+        log.info("[SCOUT] Researching '%s'...", topic)
+        user_message = self._build_research_message(topic)
 
         brief = self.client.call_agent(
             agent_type="scout",
@@ -129,7 +135,7 @@ class TechScoutAgent:
             max_tokens=2048
         )
 
-        print("[SCOUT] Research complete")
+        log.info("[SCOUT] Research complete")
 
         return {
             "topic": topic,
@@ -138,6 +144,57 @@ class TechScoutAgent:
             "mode": mode
         }
 
+    async def research_topic_async(self, topic: Optional[str] = None, model: Optional[str] = None) -> Dict:
+        """
+        Async variant of `research_topic` for the async workflow nodes.
+
+        The blocking HackerNews scrape runs in a worker thread so it doesn't
+        stall the event loop.
+
+        Args:
+            topic: Specific topic to research. If None, auto-discover trending.
+            model: Override the scout model (e.g. a faster fallback on timeout)
+        """
+        mode = "live"
+
+        if not topic:
+            log.info("[SCOUT] Auto-discovering trending topics for %s...", self.channel_name)
+            trending = await asyncio.to_thread(self._get_trending_safe)
+            if self.demo_mode or isinstance(trending, list) and len(trending) > 0:
+                mode = "cached" if self.demo_mode else "live"
+            topic = await self._select_best_topic_async(trending, model=model)
+            log.info("[SCOUT] Selected topic: %s", topic)
+
+        log.info("[SCOUT] Researching '%s'...", topic)
+        brief = await self.client.acall_agent(
+            agent_type="scout",
+            system_prompt=self.system_prompt,
+            user_message=self._build_research_message(topic),
+            model=model,
+            max_tokens=2048
+        )
+
+        log.info("[SCOUT] Research complete")
+
+        return {
+            "topic": topic,
+            "brief": brief,
+            "sources": [],  # Would add real sources in production
+            "mode": mode
+        }
+
+    def _build_research_message(self, topic: str) -> str:
+        """Build the research request for a topic"""
+        return cleandoc(f"""Research this topic for a {self.channel_name} video: {topic}
+
+        Provide:
+        - Core concept explanation (what is this?)
+        - Why developers should care
+        - Controversial or funny angles
+        - Key technical details
+        - Meme opportunities or visual ideas
+        - Similar or related topics""")
+
     def _get_trending_safe(self) -> List[Dict]:
         """
         Get trending topics with automatic fallback to cached data.
@@ -148,52 +205,35 @@ class TechScoutAgent:
         - On timeout/error: Falls back to cached data
         - On missing cache: Falls back to hardcoded topics
 
-        Cross-platform: Uses threading (works on Windows, Mac, Linux)
+        The 5-second budget is enforced inside `get_trending_hn`, which
+        cancels any outstanding request once it runs out.
 
         Returns:
             List of trending items with id, title, score, url fields
         """
         if self.demo_mode:
-            print("[SCOUT] DEMO MODE: Using cached trending topics")
+            log.info("[SCOUT] DEMO MODE: Using cached trending topics")
             return self._load_cached_trends()
 
         try:
-            # Use threading for cross-platform timeout support
-            result = [None]  # Mutable container for thread result
-            error = [None]
-
-            def scrape_with_timeout():
-                try:
-                    result[0] = get_trending_hn(limit=10)
-                except Exception as e:
-                    error[0] = e
-
-            thread = threading.Thread(target=scrape_with_timeout, daemon=True)
-            thread.start()
-            thread.join(timeout=5.0)  # 5-second timeout
-
-            # Check if thread finished
-            if thread.is_alive():
-                print("[SCOUT] HackerNews API timeout (>5s), using cached data")
-                return self._load_cached_trends()
-
-            # Check for errors
-            if error[0]:
-                print(f"[SCOUT] HackerNews API error: {error[0]}, using cached data")
-                return self._load_cached_trends()
-
-            # Check if we got results
-            if not result[0]:
-                print("[SCOUT] No results from HackerNews, using cached data")
-                return self._load_cached_trends()
-
-            print("[SCOUT] Using live HackerNews data")
-            return result[0]
+            trending = get_trending_hn(limit=10, timeout=5.0)
+
+        except TimeoutError:
+            log.warning("[SCOUT] HackerNews API timeout (>5s), using cached data")
+            return self._load_cached_trends()
 
         except Exception as e:
-            print(f"[SCOUT] Unexpected error: {e}, using cached data")
+            log.warning("[SCOUT] HackerNews API error: %s, using cached data", e)
+            return self._load_cached_trends()
+
+        # Check if we got results
+        if not trending:
+            log.warning("[SCOUT] No results from HackerNews, using cached data")
             return self._load_cached_trends()
 
+        log.info("[SCOUT] Using live HackerNews data")
+        return trending
+
     def _load_cached_trends(self) -> List[Dict]:
         """
         Load pre-saved trending topics for demo reliability.
@@ -213,16 +253,20 @@ class TechScoutAgent:
         cache_file = project_root / "examples" / "cached_hn_trending.json"
 
         try:
-            with open(cache_file, 'r') as f:
-                data = json.load(f)
-                print(f"[SCOUT] Loaded {len(data)} cached trends")
-                return data
+            # Re-parsed only when the file changes
+            key = (cache_file, cache_file.stat().st_mtime_ns)
+            if key not in _CACHED_TRENDS:
+                _CACHED_TRENDS.clear()
+                _CACHED_TRENDS[key] = orjson.loads(cache_file.read_bytes())
+            data = list(_CACHED_TRENDS[key])
+            log.info("[SCOUT] Loaded %s cached trends", len(data))
+            return data
         except FileNotFoundError as e:
             raise FileNotFoundError(
                 f"Cache file required: {cache_file}\n"
                 f"Please ensure examples/cached_hn_trending.json exists with trending topics."
             ) from e
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise ValueError(
                 f"Invalid JSON in cache file ({cache_file}): {e}"
             ) from e
@@ -246,14 +290,82 @@ class TechScoutAgent:
         """
         if not trending_items:
             return "The Latest JavaScript Framework Nobody Asked For"
+        if len(trending_items) == 1:
+            # Nothing to choose between
+            return trending_items[0]['title']
+
+        key = self._selection_key(trending_items)
+        if (cached := self._cached_selection(key)) is not None:
+            return cached
+
+        prompt = self._build_selection_prompt(trending_items)
+
+        response = self.client.call_agent(
+            agent_type="scout",
+            system_prompt=_TOPIC_SELECTOR_PROMPT,
+            user_message=prompt,
+            temperature=0.3,
+            max_tokens=100
+        )
 
+        topic = response.strip()
+        _SELECTION_CACHE[key] = (time.monotonic(), topic)
+        return topic
+
+    async def _select_best_topic_async(self, trending_items: List[Dict], model: Optional[str] = None) -> str:
+        """
+        Async variant of `_select_best_topic`.
+        """
+        if not trending_items:
+            return "The Latest JavaScript Framework Nobody Asked For"
+        if len(trending_items) == 1:
+            # Nothing to choose between
+            return trending_items[0]['title']
+
+        key = self._selection_key(trending_items)
+        if (cached := self._cached_selection(key)) is not None:
+            return cached
+
+        response = await self.client.acall_agent(
+            agent_type="scout",
+            system_prompt=_TOPIC_SELECTOR_PROMPT,
+            user_message=self._build_selection_prompt(trending_items),
+            model=model,
+            temperature=0.3,
+            max_tokens=100
+        )
+
+        topic = response.strip()
+        _SELECTION_CACHE[key] = (time.monotonic(), topic)
+        return topic
+
+    def _selection_key(self, trending_items: List[Dict]) -> tuple:
+        """Selection cache key: channel plus the stories shown to the selector"""
+        return (self.channel_name, tuple(item.get('id', item['title']) for item in trending_items[:10]))
+
+    @staticmethod
+    def _cached_selection(key: tuple) -> Optional[str]:
+        """Topic picked for `key` within the last SELECTION_CACHE_TTL_S seconds, if any"""
+        entry = _SELECTION_CACHE.get(key)
+        if entry is None:
+            return None
+        picked_at, topic = entry
+        if time.monotonic() - picked_at > SELECTION_CACHE_TTL_S:
+            del _SELECTION_CACHE[key]
+            return None
+        log.info("[SCOUT] Reusing topic picked for this trending list")
+        return topic
+
+    def _build_selection_prompt(self, trending_items: List[Dict]) -> str:
+        """Format trending items into the topic selection prompt"""
         # Format topics for LLM
         topics_str = "\n".join([
             f"{i+1}. {item['title']} (score: {item.get('score', 'N/A')})"
             for i, item in enumerate(trending_items[:10])  # Top 10
         ])
 
-        prompt = f"""From these trending tech topics, pick the ONE
+        # The topic list is multi-line, so it is appended after dedenting
+        prompt = cleandoc("""From these trending tech topics, pick the ONE
         that would make the best Fireship video. Consider:
         - Developer relevance and interest
         - Meme potential or humor angle
@@ -261,17 +373,9 @@ class TechScoutAgent:
         - Controversy level (if appropriate)
         - How well it aligns with Fireship's sarcastic, meme-heavy style
 
-        Topics:
-        {topics_str}
-
-        Respond with ONLY the topic title (exactly as written above), nothing else."""
+        Topics:""")
 
-        response = self.client.call_agent(
-            agent_type="scout",
-            system_prompt="You are a topic selector for Fireship. Pick topics that align with sarcastic humor, developer pain points, and tech culture.",
-            user_message=prompt,
-            temperature=0.3,
-            max_tokens=100
+        return (
+            f"{prompt}\n{topics_str}\n\n"
+            "Respond with ONLY the topic title (exactly as written above), nothing else."
         )
-
-        return response.strip()
@@ -7,6 +7,8 @@ Coordinates all three agents (Scout, Writer, Validator) into a single workflow.
 from .workflow import (
     WorkflowState,
     run_workflow,
+    run_workflow_async,
+    run_workflow_batch,
 )
 
-__all__ = ["WorkflowState", "run_workflow"]
+__all__ = ["WorkflowState", "run_workflow", "run_workflow_async", "run_workflow_batch"]
@@ -7,17 +7,56 @@ Coordinates three agents into a self-correcting workflow:
 3. Validator: Score brand voice compliance
 
 Flow:
-  Scout → Draft → Validate → [Refine if score < 75] → END
+  Scout → Draft (N candidates) → Validate (pick best) → [Refine if score < 75*] → END
+
+  * Near misses (70-74 by default) with at most two weaknesses are accepted as is
 """
 
-from typing import TypedDict, Optional, List, Literal
+from functools import partial
+from typing import Any, Awaitable, Callable, TypedDict, Optional, List, Literal, Tuple
+from langgraph.cache.memory import InMemoryCache
 from langgraph.graph import StateGraph, END
+from langgraph.types import CachePolicy
 from src.agents.tech_scout import TechScoutAgent
 from src.agents.script_writer import ScriptWriterAgent
 from src.agents.brand_voice import BrandVoiceAgent
 from src.utils.openai_client import OpenAIClient
 from src.utils.brand_voice_loader import load_brand_voice
+from src.utils.llm_cache import LLMCache
+import asyncio
+import logging
 import os
+import time
+
+log = logging.getLogger(__name__)
+
+
+# Per-phase wall-clock budgets (seconds); a timed-out phase is retried once
+# with FALLBACK_MODEL before the workflow gives up
+SCOUT_TIMEOUT_S = float(os.getenv("SCOUT_TIMEOUT_S", "30"))
+WRITER_TIMEOUT_S = float(os.getenv("WRITER_TIMEOUT_S", "90"))
+VALIDATOR_TIMEOUT_S = float(os.getenv("VALIDATOR_TIMEOUT_S", "45"))
+FALLBACK_MODEL = "gpt-4.1-mini"
+
+# Best-of-N drafting: candidates are generated and scored in parallel, one
+# temperature per candidate, so a good draft usually lands without refinement
+DRAFT_CANDIDATES = int(os.getenv("DRAFT_CANDIDATES", "3"))
+DRAFT_TEMPERATURES = (0.3, 0.7, 0.9)
+
+# Scripts scoring below REFINE_THRESHOLD are refined, except near-misses
+# (within REFINE_MIN_DELTA) with few weaknesses, where another writer round
+# rarely changes the outcome
+REFINE_THRESHOLD = 75
+REFINE_MIN_DELTA = int(os.getenv("REFINE_MIN_DELTA", "5"))
+NEAR_MISS_MAX_WEAKNESSES = 2
+
+# Scout and validate results are reused when a node sees the exact same input
+# again (e.g. rerunning a topic); shared by every compiled graph in the process
+NODE_CACHE_TTL_S = int(os.getenv("NODE_CACHE_TTL_S", "900"))
+_NODE_CACHE = InMemoryCache()
+
+# Called as progress_callback(stage_description, fraction_complete) as each node finishes
+ProgressCallback = Callable[[str, float], None]
 
 
 class WorkflowState(TypedDict):
@@ -36,6 +75,7 @@ class WorkflowState(TypedDict):
 
     # Writer output
     draft_script: Optional[str]
+    draft_candidates: Optional[List[str]]
 
     # Validator output
     brand_score: Optional[int]
@@ -56,7 +96,77 @@ class WorkflowState(TypedDict):
     execution_mode: str  # "live" or "cached"
 
 
-def scout_node(state: WorkflowState, scout: TechScoutAgent) -> WorkflowState:
+async def _call_with_timeout(
+    state: WorkflowState,
+    agent_name: str,
+    timeout_s: float,
+    call: Callable[[Optional[str]], Awaitable[Any]]
+) -> Any:
+    """
+    Run `call(model)` under a timeout, retrying once with FALLBACK_MODEL.
+
+    `call` receives the model override (None for the agent's default).
+    Timeouts are recorded in state['errors'] as `agent_timeout` events.
+
+    Raises:
+        TimeoutError: If the fallback attempt also exceeds the budget
+    """
+    for model in (None, FALLBACK_MODEL):
+        started = time.monotonic()
+        try:
+            return await asyncio.wait_for(call(model), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            elapsed = time.monotonic() - started
+            event = f"agent_timeout: {agent_name} ({model or 'default model'}) took {elapsed:.1f}s, limit {timeout_s:.0f}s"
+            log.warning("[TIMEOUT] %s", event)
+            state['errors'].append(event)
+
+    raise TimeoutError(f"{agent_name} timed out twice (limit {timeout_s:.0f}s)")
+
+
+def _draft_temperatures(num_candidates: int) -> List[float]:
+    """
+    Sampling temperature per draft candidate.
+
+    Up to three candidates use DRAFT_TEMPERATURES; larger N spreads evenly
+    across the same 0.3-0.9 range.
+
+    Raises:
+        ValueError: If num_candidates is less than 1
+    """
+    if num_candidates < 1:
+        raise ValueError(f"num_candidates must be at least 1, got {num_candidates}")
+    if num_candidates <= len(DRAFT_TEMPERATURES):
+        return list(DRAFT_TEMPERATURES[:num_candidates])
+    low, high = DRAFT_TEMPERATURES[0], DRAFT_TEMPERATURES[-1]
+    step = (high - low) / (num_candidates - 1)
+    return [round(low + i * step, 2) for i in range(num_candidates)]
+
+
+def _progress_event(node: str, state: WorkflowState) -> Optional[Tuple[str, float]]:
+    """
+    (stage, fraction) to report once `node` has produced `state`.
+
+    Derived from the streamed state rather than reported by the nodes
+    themselves, so a node served from the node cache still advances progress.
+    """
+    if node == "scout":
+        return "Scout Agent: research complete", 0.25
+    if node == "draft":
+        return f"Writer Agent: {len(state.get('draft_candidates') or [])} draft(s) ready", 0.5
+    if node == "validate":
+        if state.get('should_refine'):
+            return f"Validator Agent: score {state['brand_score']}/100, refining...", 0.75
+        return f"Validator Agent: score {state['brand_score']}/100", 1.0
+    if node == "refine":
+        return f"Refinement {state['iteration']}/2 complete, re-validating...", 0.75
+    return None
+
+
+async def scout_node(
+    state: WorkflowState,
+    scout: TechScoutAgent
+) -> WorkflowState:
     """
     Node 1: Research topic using TechScoutAgent.
 
@@ -64,68 +174,132 @@ def scout_node(state: WorkflowState, scout: TechScoutAgent) -> WorkflowState:
     Updates state with research brief and sources.
     """
     try:
-        print(f"\n[SCOUT] Researching topic: {state.get('topic', 'auto-discover')}")
+        log.info("\n[SCOUT] Researching topic: %s", state.get('topic', 'auto-discover'))
 
-        result = scout.research_topic(state.get('topic'))
+        result = await _call_with_timeout(
+            state, "scout", SCOUT_TIMEOUT_S,
+            lambda model: scout.research_topic_async(state.get('topic'), model=model)
+        )
 
         state['research_brief'] = result['brief']
         state['research_sources'] = result.get('sources', [])
         state['execution_mode'] = result.get('mode', 'live')
         state['topic'] = result['topic']
 
-        print(f"[SCOUT] Research complete. Topic: {state['topic']}")
+        log.info("[SCOUT] Research complete. Topic: %s", state['topic'])
         return state
 
     except Exception as e:
         error_msg = f"Scout error: {str(e)}"
-        print(f"[ERROR] {error_msg}")
+        log.error("[ERROR] %s", error_msg)
         state['errors'].append(error_msg)
         raise
 
 
-def draft_node(state: WorkflowState, writer: ScriptWriterAgent) -> WorkflowState:
+async def draft_node(
+    state: WorkflowState,
+    writer: ScriptWriterAgent,
+    streaming_callback: Optional[Callable[[str], None]] = None,
+    num_candidates: int = DRAFT_CANDIDATES
+) -> WorkflowState:
     """
-    Node 2: Generate script using ScriptWriterAgent.
+    Node 2: Generate candidate scripts using ScriptWriterAgent.
 
     Takes research brief from scout output.
-    Updates state with draft script.
+    Fans out `num_candidates` drafts in parallel (one temperature each, see
+    `_draft_temperatures`); the validator picks the best one. Failed
+    candidates are logged and dropped, and the node only fails when none
+    succeed. Tokens of the first candidate are forwarded to
+    `streaming_callback` as they arrive.
+    Updates state with draft candidates and draft script.
     """
     try:
-        print(f"\n[WRITER] Generating {state['format_type']} script...")
+        temperatures = _draft_temperatures(num_candidates)
+        log.info("\n[WRITER] Generating %s %s candidate(s)...", len(temperatures), state['format_type'])
 
         if not state.get('research_brief'):
             raise ValueError("No research brief available for script generation")
 
-        script = writer.generate_script(
-            research_brief=state['research_brief'],
-            format_type=state['format_type']
-        )
-
-        state['draft_script'] = script
-        print(f"[WRITER] Script generated ({len(script)} chars)")
+        def generate(temperature: float, callback: Optional[Callable[[str], None]]):
+            return _call_with_timeout(
+                state, "writer", WRITER_TIMEOUT_S,
+                lambda model: writer.generate_script_async(
+                    research_brief=state['research_brief'],
+                    format_type=state['format_type'],
+                    streaming_callback=callback,
+                    model=model,
+                    temperature=temperature
+                )
+            )
+
+        # Only the first candidate streams, so the preview isn't interleaved
+        outcomes = await asyncio.gather(*[
+            generate(temperature, streaming_callback if i == 0 else None)
+            for i, temperature in enumerate(temperatures)
+        ], return_exceptions=True)
+
+        # Keep whichever drafts succeeded; the node only fails if all of them did
+        scripts = [outcome for outcome in outcomes if not isinstance(outcome, BaseException)]
+        failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        if not scripts:
+            raise failures[0]
+        for temperature, outcome in zip(temperatures, outcomes):
+            if isinstance(outcome, BaseException):
+                log.warning("[WRITER] Candidate at temperature %s failed: %s", temperature, outcome)
+                state['errors'].append(f"Writer candidate failed (temperature {temperature}): {outcome}")
+
+        state['draft_candidates'] = scripts
+        state['draft_script'] = scripts[0]
+        log.info("[WRITER] Generated %s candidate(s) (%s)", len(scripts), ', '.join(f'{len(s)} chars' for s in scripts))
         return state
 
     except Exception as e:
         error_msg = f"Writer error: {str(e)}"
-        print(f"[ERROR] {error_msg}")
+        log.error("[ERROR] %s", error_msg)
         state['errors'].append(error_msg)
         raise
 
 
-def validate_node(state: WorkflowState, validator: BrandVoiceAgent) -> WorkflowState:
+async def validate_node(
+    state: WorkflowState,
+    validator: BrandVoiceAgent
+) -> WorkflowState:
     """
     Node 3: Validate script against brand voice using BrandVoiceAgent.
 
-    Takes draft script from writer output.
-    Updates state with validation scores and feedback.
+    Takes draft script (or all draft candidates) from writer output.
+    Candidates are scored concurrently and the highest-scoring one becomes
+    the draft script. Updates state with validation scores and feedback.
     """
     try:
-        print(f"\n[VALIDATOR] Scoring script against brand voice...")
+        log.info("\n[VALIDATOR] Scoring script against brand voice...")
 
         if not state.get('draft_script'):
             raise ValueError("No draft script available for validation")
 
-        result = validator.validate_script(state['draft_script'])
+        candidates = state.get('draft_candidates') or [state['draft_script']]
+
+        # Heuristic-only scores aren't on the blended heuristic/LLM scale, so
+        # they're only allowed when there is nothing to rank against
+        allow_heuristic_only = len(candidates) == 1
+
+        def score(script: str):
+            return _call_with_timeout(
+                state, "validator", VALIDATOR_TIMEOUT_S,
+                lambda model: validator.validate_script_async(
+                    script, model=model, allow_heuristic_only=allow_heuristic_only
+                )
+            )
+
+        results = await asyncio.gather(*[score(script) for script in candidates])
+
+        best = max(range(len(candidates)), key=lambda i: results[i]['score'])
+        result = results[best]
+        if len(candidates) > 1:
+            log.info("[VALIDATOR] Candidate scores: %s, picked #%s", [r['score'] for r in results], best + 1)
+
+        state['draft_script'] = candidates[best]
+        state['draft_candidates'] = None
 
         state['brand_score'] = result['score']
         state['heuristic_score'] = result['heuristic_score']
@@ -135,29 +309,39 @@ def validate_node(state: WorkflowState, validator: BrandVoiceAgent) -> WorkflowS
         state['validation_weaknesses'] = result['weaknesses']
         state['validation_suggestions'] = result['suggestions']
 
-        print(f"[VALIDATOR] Score: {state['brand_score']}/100 (Heuristic: {state['heuristic_score']}, LLM: {state['llm_score']})")
+        log.info("[VALIDATOR] Score: %s/100 (Heuristic: %s, LLM: %s)", state['brand_score'], state['heuristic_score'], state['llm_score'])
 
         # Determine if refinement is needed
-        if state['brand_score'] < 75 and state['iteration'] < 2:
+        near_miss = (
+            state['brand_score'] >= REFINE_THRESHOLD - REFINE_MIN_DELTA
+            and len(result['weaknesses']) <= NEAR_MISS_MAX_WEAKNESSES
+        )
+        if state['brand_score'] < REFINE_THRESHOLD and not near_miss and state['iteration'] < 2:
             state['should_refine'] = True
-            print(f"[VALIDATOR] Score < 75, will refine (iteration {state['iteration']} of 2)")
+            log.info("[VALIDATOR] Score < %s, will refine (iteration %s of 2)", REFINE_THRESHOLD, state['iteration'])
         else:
             state['should_refine'] = False
-            if state['brand_score'] >= 75:
-                print(f"[VALIDATOR] Score >= 75, script accepted!")
+            if state['brand_score'] >= REFINE_THRESHOLD:
+                log.info("[VALIDATOR] Score >= %s, script accepted!", REFINE_THRESHOLD)
+            elif near_miss:
+                log.info("[VALIDATOR] Near miss with minor weaknesses, script accepted")
             else:
-                print(f"[VALIDATOR] Max refinements reached, using current script")
+                log.info("[VALIDATOR] Max refinements reached, using current script")
 
         return state
 
     except Exception as e:
         error_msg = f"Validator error: {str(e)}"
-        print(f"[ERROR] {error_msg}")
+        log.error("[ERROR] %s", error_msg)
         state['errors'].append(error_msg)
         raise
 
 
-def refine_node(state: WorkflowState, writer: ScriptWriterAgent) -> WorkflowState:
+async def refine_node(
+    state: WorkflowState,
+    writer: ScriptWriterAgent,
+    streaming_callback: Optional[Callable[[str], None]] = None
+) -> WorkflowState:
     """
     Node 4: Refine script based on validator feedback.
 
@@ -166,37 +350,31 @@ def refine_node(state: WorkflowState, writer: ScriptWriterAgent) -> WorkflowStat
     """
     try:
         state['iteration'] += 1
-        print(f"\n[REFINE] Refining script (iteration {state['iteration']}/2)...")
+        log.info("\n[REFINE] Refining script (iteration %s/2)...", state['iteration'])
 
         if not state.get('draft_script'):
             raise ValueError("No draft script to refine")
 
-        # Build refinement prompt with validator feedback
-        refinement_prompt = f"""Previous script feedback:
-
-        Weaknesses:
-        {chr(10).join(f"- {w}" for w in state['validation_weaknesses'])}
-
-        Suggestions for improvement:
-        {chr(10).join(f"- {s}" for s in state['validation_suggestions'])}
-
-        Original script to refine:
-        {state['draft_script']}
-
-        Please refine the script addressing the weaknesses and suggestions above."""
-
-        refined_script = writer.generate_script(
-            research_brief=refinement_prompt,
-            format_type=state['format_type']
+        # Rewrite the draft against the validator feedback
+        refined_script = await _call_with_timeout(
+            state, "writer", WRITER_TIMEOUT_S,
+            lambda model: writer.refine_script_async(
+                state['draft_script'],
+                state['validation_weaknesses'],
+                state['validation_suggestions'],
+                format_type=state['format_type'],
+                streaming_callback=streaming_callback,
+                model=model
+            )
         )
 
         state['draft_script'] = refined_script
-        print(f"[REFINE] Script refined ({len(refined_script)} chars)")
+        log.info("[REFINE] Script refined (%s chars)", len(refined_script))
         return state
 
     except Exception as e:
         error_msg = f"Refine error: {str(e)}"
-        print(f"[ERROR] {error_msg}")
+        log.error("[ERROR] %s", error_msg)
         state['errors'].append(error_msg)
         raise
 
@@ -206,7 +384,8 @@ def should_refine(state: WorkflowState) -> str:
     Conditional edge logic: Decide whether to refine or end.
 
     Returns:
-        "refine" if score < 75 and iteration < 2
+        "refine" if validate_node flagged the script (score < 75, not a
+        near miss) and iteration < 2
         END otherwise
     """
     if state.get('should_refine', False) and state['iteration'] < 2:
@@ -214,7 +393,26 @@ def should_refine(state: WorkflowState) -> str:
     return END
 
 
-def build_workflow(openai_client: OpenAIClient, channel_name: str = "Fireship", demo_mode: bool = False):
+def _node_cache_policy(channel_name: str, demo_mode: bool) -> CachePolicy:
+    """
+    Cache policy keyed on a node's full input state.
+
+    The channel and demo mode are bound into the graph rather than carried in
+    the state, so they are part of the key too.
+    """
+    return CachePolicy(
+        key_func=lambda state: LLMCache.make_key(channel=channel_name, demo_mode=demo_mode, state=state),
+        ttl=NODE_CACHE_TTL_S
+    )
+
+
+def build_workflow(
+    openai_client: OpenAIClient,
+    channel_name: str = "Fireship",
+    demo_mode: bool = False,
+    streaming_callback: Optional[Callable[[str], None]] = None,
+    num_candidates: int = DRAFT_CANDIDATES
+):
     """
     Build and compile the LangGraph workflow.
 
@@ -222,10 +420,18 @@ def build_workflow(openai_client: OpenAIClient, channel_name: str = "Fireship",
         openai_client: OpenAI client for all agents
         channel_name: YouTube channel name
         demo_mode: Whether to use demo mode for reliability
+        streaming_callback: Optional callback receiving the writer's script-so-far
+        num_candidates: Number of parallel first drafts to pick the best from
 
     Returns:
         Compiled graph ready for execution
+
+    Raises:
+        ValueError: If num_candidates is less than 1
     """
+    # Fail on a bad candidate count before any agent is built
+    _draft_temperatures(num_candidates)
+
     # Initialize agents
     scout = TechScoutAgent(openai_client, channel_name=channel_name, demo_mode=demo_mode)
     writer = ScriptWriterAgent(openai_client, channel_name=channel_name, demo_mode=demo_mode)
@@ -235,11 +441,20 @@ def build_workflow(openai_client: OpenAIClient, channel_name: str = "Fireship",
     # Create graph
     workflow = StateGraph(WorkflowState)
 
-    # Add nodes - wrap with lambda to pass agents
-    workflow.add_node("scout", lambda state: scout_node(state, scout))
-    workflow.add_node("draft", lambda state: draft_node(state, writer))
-    workflow.add_node("validate", lambda state: validate_node(state, validator))
-    workflow.add_node("refine", lambda state: refine_node(state, writer))
+    # Add nodes - bind agents with partial so LangGraph still sees coroutine functions
+    cache_policy = _node_cache_policy(channel_name, demo_mode)
+    workflow.add_node(
+        "scout", partial(scout_node, scout=scout),
+        cache_policy=cache_policy
+    )
+    workflow.add_node("draft", partial(
+        draft_node, writer=writer, streaming_callback=streaming_callback, num_candidates=num_candidates
+    ))
+    workflow.add_node(
+        "validate", partial(validate_node, validator=validator),
+        cache_policy=cache_policy
+    )
+    workflow.add_node("refine", partial(refine_node, writer=writer, streaming_callback=streaming_callback))
 
     # Add edges
     workflow.add_edge("scout", "draft")  # Scout always leads to draft
@@ -262,22 +477,52 @@ def build_workflow(openai_client: OpenAIClient, channel_name: str = "Fireship",
     workflow.set_entry_point("scout")
 
     # Compile
-    app = workflow.compile()
+    app = workflow.compile(cache=_NODE_CACHE)
 
     return app
 
 
-def run_workflow(
+def _initial_state(topic: Optional[str], format_type: str) -> WorkflowState:
+    """Fresh workflow state for one topic"""
+    return {
+        "topic": topic,
+        "format_type": format_type,
+        "research_brief": None,
+        "research_sources": None,
+        "draft_script": None,
+        "draft_candidates": None,
+        "brand_score": None,
+        "heuristic_score": None,
+        "llm_score": None,
+        "validation_reasoning": None,
+        "validation_strengths": None,
+        "validation_weaknesses": None,
+        "validation_suggestions": None,
+        "final_script": None,
+        "iteration": 0,
+        "should_refine": False,
+        "errors": [],
+        "execution_mode": "live"
+    }
+
+
+async def run_workflow_async(
     topic: Optional[str] = None,
     format_type: str = "100_seconds",
     channel_name: str = "Fireship",
     demo_mode: bool = False,
-    openai_client: Optional[OpenAIClient] = None
+    openai_client: Optional[OpenAIClient] = None,
+    streaming_callback: Optional[Callable[[str], None]] = None,
+    num_candidates: int = DRAFT_CANDIDATES,
+    progress_callback: Optional[ProgressCallback] = None
 ) -> WorkflowState:
     """
-    Execute the complete workflow.
+    Execute the complete workflow on the running event loop.
 
-    Main entry point for the orchestration system.
+    Async entry point for the orchestration system; nodes await their agents
+    so independent LLM calls overlap: the draft candidates are generated
+    concurrently, and so are their validations. Each validation runs its
+    heuristic check first and only then (if needed) the LLM check.
 
     Args:
         topic: Topic to research (optional, auto-discovers if None)
@@ -285,12 +530,18 @@ def run_workflow(
         channel_name: YouTube channel name
         demo_mode: Use demo mode for reliability (DEMO_MODE env var overrides)
         openai_client: OpenAI client (creates one if None)
+        streaming_callback: Called with the writer's script-so-far while drafts
+            and refinements stream in (throttled to ~100ms)
+        num_candidates: Parallel first drafts to generate; the best-scoring
+            one is kept (defaults to DRAFT_CANDIDATES)
+        progress_callback: Called with (stage, fraction) as each node finishes,
+            e.g. to drive a progress bar from real workflow events
 
     Returns:
         Final workflow state with generated script and metadata
 
     Example:
-        result = run_workflow(
+        result = await run_workflow_async(
             topic="WebAssembly",
             format_type="100_seconds",
             channel_name="Fireship",
@@ -299,80 +550,192 @@ def run_workflow(
         print(f"Final Script:\\n{result['final_script']}")
         print(f"Score: {result['brand_score']}/100")
     """
-    # Create client if not provided
-    if openai_client is None:
+    # Create client if not provided (and close its connections when done)
+    owns_client = openai_client is None
+    if owns_client:
         openai_client = OpenAIClient()
 
     # Check environment for demo mode override
     demo_mode = demo_mode or os.getenv("DEMO_MODE", "false").lower() == "true"
 
-    print("\n" + "="*80)
-    print("FIRESHIP AI WORKFLOW")
-    print("="*80)
-    print(f"Topic: {topic or 'auto-discover'}")
-    print(f"Format: {format_type}")
-    print(f"Channel: {channel_name}")
-    print(f"Mode: {'DEMO' if demo_mode else 'LIVE'}")
-    print("="*80)
+    # One record per block, so concurrent runs can't interleave mid-banner
+    log.info("\n".join([
+        "\n" + "="*80,
+        "FIRESHIP AI WORKFLOW",
+        "="*80,
+        f"Topic: {topic or 'auto-discover'}",
+        f"Format: {format_type}",
+        f"Channel: {channel_name}",
+        f"Mode: {'DEMO' if demo_mode else 'LIVE'}",
+        "="*80
+    ]))
+
+    # Initialize state (before the try, so a failed build can still report into it)
+    initial_state = _initial_state(topic, format_type)
 
     try:
         # Build workflow
-        app = build_workflow(openai_client, channel_name, demo_mode)
-
-        # Initialize state
-        initial_state: WorkflowState = {
-            "topic": topic,
-            "format_type": format_type,
-            "research_brief": None,
-            "research_sources": None,
-            "draft_script": None,
-            "brand_score": None,
-            "heuristic_score": None,
-            "llm_score": None,
-            "validation_reasoning": None,
-            "validation_strengths": None,
-            "validation_weaknesses": None,
-            "validation_suggestions": None,
-            "final_script": None,
-            "iteration": 0,
-            "should_refine": False,
-            "errors": [],
-            "execution_mode": "live"
-        }
-
-        # Run workflow
-        print("\nStarting workflow execution...\n")
-        final_state = app.invoke(initial_state)
+        app = build_workflow(openai_client, channel_name, demo_mode, streaming_callback, num_candidates)
+
+        # Run workflow; "values" carries the latest full state, "updates" names
+        # the node that produced it (cache hits included) for progress events
+        log.info("\nStarting workflow execution...\n")
+        final_state = initial_state
+        with openai_client.track_usage() as usage:
+            async for mode, chunk in app.astream(initial_state, stream_mode=["updates", "values"]):
+                if mode == "values":
+                    final_state = chunk
+                elif progress_callback is not None:
+                    # Cache hits add a "__metadata__" entry, which maps to no event
+                    for node, update in chunk.items():
+                        event = _progress_event(node, update)
+                        if event is not None:
+                            progress_callback(*event)
 
         # Set final script
         final_state['final_script'] = final_state.get('draft_script', None)
 
         # Print summary
-        print("\n" + "="*80)
-        print("WORKFLOW COMPLETE")
-        print("="*80)
-        print(f"Topic: {final_state['topic']}")
-        print(f"Iterations: {final_state['iteration']}")
-        print(f"Brand Score: {final_state['brand_score']}/100")
-        print(f"Execution Mode: {final_state['execution_mode']}")
+        summary = [
+            "\n" + "="*80,
+            "WORKFLOW COMPLETE",
+            "="*80,
+            f"Topic: {final_state['topic']}",
+            f"Iterations: {final_state['iteration']}",
+            f"Brand Score: {final_state['brand_score']}/100",
+            f"Execution Mode: {final_state['execution_mode']}"
+        ]
+
+        prompt_tokens = usage['prompt_tokens']
+        cached_tokens = usage['cached_tokens']
+        if prompt_tokens:
+            summary.append(f"Prompt Cache: {cached_tokens}/{prompt_tokens} prompt tokens cached ({cached_tokens / prompt_tokens:.0%})")
 
         if final_state['errors']:
-            print(f"Errors: {len(final_state['errors'])}")
-            for error in final_state['errors']:
-                print(f"  - {error}")
+            summary.append(f"Errors: {len(final_state['errors'])}")
+            summary.extend(f"  - {error}" for error in final_state['errors'])
         else:
-            print("Status: Success")
+            summary.append("Status: Success")
 
-        print("="*80 + "\n")
+        summary.append("="*80 + "\n")
+        log.info("\n".join(summary))
 
         return final_state
 
     except Exception as e:
-        print(f"\n[FATAL] Workflow execution failed: {e}")
-        import traceback
-        traceback.print_exc()
+        # Traceback is only formatted if a handler actually emits it.
+        # asyncio.CancelledError is a BaseException and propagates untouched.
+        log.exception("\n[FATAL] Workflow execution failed: %s", e)
 
         # Return state with error
         initial_state['errors'].append(f"Workflow fatal error: {str(e)}")
         initial_state['final_script'] = None
         return initial_state
+
+    finally:
+        if owns_client:
+            await openai_client.aclose()
+
+
+def run_workflow(
+    topic: Optional[str] = None,
+    format_type: str = "100_seconds",
+    channel_name: str = "Fireship",
+    demo_mode: bool = False,
+    openai_client: Optional[OpenAIClient] = None,
+    streaming_callback: Optional[Callable[[str], None]] = None,
+    num_candidates: int = DRAFT_CANDIDATES,
+    progress_callback: Optional[ProgressCallback] = None
+) -> WorkflowState:
+    """
+    Execute the complete workflow (blocking).
+
+    Synchronous wrapper around `run_workflow_async` for CLI callers.
+    Must not be called from inside a running event loop. The client's pool
+    for the temporary loop is closed before returning.
+
+    Example:
+        result = run_workflow(topic="WebAssembly", demo_mode=True)
+        print(f"Score: {result['brand_score']}/100")
+    """
+    if openai_client is None:
+        openai_client = OpenAIClient()
+
+    return openai_client.run(run_workflow_async(
+        topic=topic,
+        format_type=format_type,
+        channel_name=channel_name,
+        demo_mode=demo_mode,
+        openai_client=openai_client,
+        streaming_callback=streaming_callback,
+        num_candidates=num_candidates,
+        progress_callback=progress_callback
+    ))
+
+
+async def run_workflow_batch(
+    topics: List[Optional[str]],
+    format_type: str = "100_seconds",
+    channel_name: str = "Fireship",
+    demo_mode: bool = False,
+    openai_client: Optional[OpenAIClient] = None,
+    num_candidates: int = DRAFT_CANDIDATES
+) -> List[WorkflowState]:
+    """
+    Execute the workflow for several topics concurrently.
+
+    The graph and agents are built once and every run shares one OpenAI
+    client, so all requests go through the same rate-limited pool
+    (MAX_PARALLEL_AGENTS caps how many are in flight).
+
+    Args:
+        topics: Topics to research (None entries auto-discover)
+        format_type: Script format for every run
+        channel_name: YouTube channel name
+        demo_mode: Use demo mode for reliability (DEMO_MODE env var overrides)
+        openai_client: OpenAI client (creates one if None)
+        num_candidates: Parallel first drafts per topic
+
+    Returns:
+        Final workflow state per topic, in order. A run that fails has its
+        error recorded in `errors` and `final_script` set to None.
+
+    Example:
+        results = await run_workflow_batch(["Bun", "HTMX", "Rust"], demo_mode=True)
+        for result in results:
+            print(f"{result['topic']}: {result['brand_score']}/100")
+    """
+    owns_client = openai_client is None
+    if owns_client:
+        openai_client = OpenAIClient()
+
+    demo_mode = demo_mode or os.getenv("DEMO_MODE", "false").lower() == "true"
+
+    app = build_workflow(openai_client, channel_name, demo_mode, num_candidates=num_candidates)
+    initial_states = [_initial_state(topic, format_type) for topic in topics]
+
+    log.info("[BATCH] Running %s workflows for %s (%s)", len(topics), channel_name, format_type)
+    try:
+        outcomes = await asyncio.gather(
+            *[app.ainvoke(state) for state in initial_states],
+            return_exceptions=True
+        )
+    finally:
+        if owns_client:
+            await openai_client.aclose()
+
+    final_states = []
+    for initial_state, outcome in zip(initial_states, outcomes):
+        # BaseException, as in draft_node: a run cancelled inside gather comes
+        # back as CancelledError rather than a final state
+        if isinstance(outcome, BaseException):
+            reason = str(outcome) or type(outcome).__name__
+            log.error("[BATCH] Workflow failed for %s: %s", initial_state['topic'] or 'auto-discover', reason)
+            initial_state['errors'].append(f"Workflow fatal error: {reason}")
+            initial_state['final_script'] = None
+            final_states.append(initial_state)
+        else:
+            outcome['final_script'] = outcome.get('draft_script', None)
+            final_states.append(outcome)
+
+    return final_states
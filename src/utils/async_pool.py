@@ -0,0 +1,268 @@
+"""
+Rate-limited async request pool for OpenAI calls.
+
+Follows the OpenAI cookbook `api_request_parallel_processor` pattern:
+token buckets over requests/minute and tokens/minute, a concurrency cap,
+and exponential-backoff retries on rate-limit and connection errors.
+
+On top of the per-loop caps, a process-wide slot limit (MAX_PARALLEL_AGENTS)
+bounds in-flight requests across all event loops, e.g. concurrent Streamlit
+sessions each running their own `asyncio.run`.
+"""
+
+import asyncio
+import collections
+import contextlib
+import logging
+import os
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Deque, Optional, Tuple, TypeVar
+
+import openai
+import orjson
+
+log = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Errors worth retrying: 429s, 5xx and transient network failures (incl.
+# timeouts). Pooled clients run with the SDK's own retries disabled, so this
+# must cover everything the SDK would have retried
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.InternalServerError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+)
+
+# Other HTTP statuses the SDK retries by default (request timeout, lock conflict)
+RETRYABLE_STATUS_CODES = (408, 409)
+
+
+class _ProcessSlots:
+    """
+    Thread-safe counting semaphore shared by every event loop.
+
+    asyncio.Semaphore is bound to a single loop, so the count lives behind a
+    threading lock and each waiter parks on a future of its own loop. A
+    released slot is handed straight to the oldest waiter (woken with
+    `call_soon_threadsafe`), so slots are granted in FIFO order across loops.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._lock = threading.Lock()
+        self._waiters: Deque[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = collections.deque()
+
+    async def _acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            # Newcomers queue behind existing waiters even if a slot looks free
+            if self.in_use < self.limit and not self._waiters:
+                self.in_use += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                    granted = False
+                except ValueError:
+                    granted = True  # Slot was handed over as we were cancelled
+            if granted:
+                self._release()
+            raise
+
+    def _release(self):
+        with self._lock:
+            # Hand the slot over without freeing it, so no newcomer can take it
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(_grant, future)
+                    return
+                except RuntimeError:
+                    continue  # Waiter's loop already closed
+            self.in_use -= 1
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        """Hold one slot for the duration of the block"""
+        await self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+
+def _grant(future: asyncio.Future):
+    """Wake a slot waiter (runs on the waiter's own loop)"""
+    if not future.done():
+        future.set_result(None)
+
+
+_PROCESS_SLOTS = _ProcessSlots(int(os.getenv("MAX_PARALLEL_AGENTS", "8")))
+
+
+class TokenBucket:
+    """
+    Continuously refilling bucket holding up to `per_minute` units.
+
+    Thread-safe and not bound to an event loop, so one bucket can pace
+    requests from every loop that shares an `OpenAIClient`.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.available = float(per_minute)
+        self.refill_rate = self.capacity / 60.0  # units per second
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take `amount` units now, going into debt if the bucket is short.
+
+        Returns:
+            Seconds until the reserved units are actually available (0 if
+            they already were). Later callers queue behind earlier debt, so
+            capacity is handed out in FIFO order.
+        """
+        # A single request larger than the bucket would otherwise wait forever
+        amount = min(amount, self.capacity)
+
+        with self._lock:
+            now = time.monotonic()
+            self.available = min(
+                self.capacity,
+                self.available + (now - self.updated) * self.refill_rate
+            )
+            self.updated = now
+            self.available -= amount
+            return max(0.0, -self.available / self.refill_rate)
+
+    async def acquire(self, amount: float):
+        """Wait until `amount` units are available, then consume them"""
+        delay = self.reserve(amount)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed OpenAI request is worth retrying with backoff"""
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+    return isinstance(error, openai.APIStatusError) and (
+        error.status_code in RETRYABLE_STATUS_CODES or error.status_code >= 500
+    )
+
+
+class RateLimitedClient:
+    """
+    Wraps an `openai.AsyncOpenAI` client so every request respects
+    requests/minute, tokens/minute and concurrency limits, with retries.
+
+    Instances hold asyncio primitives and must only be used from the event
+    loop they were first used on (`OpenAIClient` keeps one per loop). Pass
+    shared `request_bucket` / `token_bucket` instances to enforce one
+    RPM/TPM budget across several pools.
+
+    Usage:
+        pool = RateLimitedClient(openai.AsyncOpenAI(max_retries=0))
+        response = await pool.chat_completion(model="gpt-4.1-mini", messages=[...])
+    """
+
+    def __init__(
+        self,
+        client: openai.AsyncOpenAI,
+        max_requests_per_minute: int = 500,
+        max_tokens_per_minute: int = 200_000,
+        max_concurrency: int = 16,
+        max_attempts: int = 5,
+        save_path: Optional[str] = None,
+        request_bucket: Optional[TokenBucket] = None,
+        token_bucket: Optional[TokenBucket] = None,
+        backoff_s: float = 1.0
+    ):
+        """
+        Args:
+            client: Async OpenAI client (ideally with max_retries=0, since
+                retries are handled here)
+            max_requests_per_minute: Request budget (RPM)
+            max_tokens_per_minute: Token budget (TPM), prompt + max output
+            max_concurrency: Max requests in flight at once
+            max_attempts: Attempts per request before giving up
+            save_path: If set, successful chat completions are appended to
+                this JSONL file as [request, response] for resumability
+            request_bucket: Shared RPM bucket (overrides max_requests_per_minute)
+            token_bucket: Shared TPM bucket (overrides max_tokens_per_minute)
+            backoff_s: Backoff unit; retry N waits ~backoff_s * 2**N plus up
+                to backoff_s of jitter (capped at 60s)
+        """
+        self.client = client
+        self.max_attempts = max_attempts
+        self.save_path = save_path
+        self.backoff_s = backoff_s
+
+        self._request_bucket = request_bucket or TokenBucket(max_requests_per_minute)
+        self._token_bucket = token_bucket or TokenBucket(max_tokens_per_minute)
+        self._concurrency = asyncio.Semaphore(max_concurrency)
+
+    async def submit(self, request_fn: Callable[[], Awaitable[T]], token_estimate: int) -> T:
+        """
+        Run `request_fn()` once capacity is available, retrying with
+        exponential backoff on rate-limit, 5xx and connection errors (see
+        `is_retryable`).
+
+        Args:
+            request_fn: Zero-argument coroutine factory issuing the API call
+            token_estimate: Tokens to reserve from the TPM budget
+
+        Returns:
+            Whatever `request_fn` returns
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            await self._request_bucket.acquire(1)
+            await self._token_bucket.acquire(token_estimate)
+
+            try:
+                async with self._concurrency, _PROCESS_SLOTS.slot():
+                    return await request_fn()
+
+            except openai.APIError as e:
+                if not is_retryable(e) or attempt == self.max_attempts:
+                    raise
+                delay = min(60.0, self.backoff_s * 2 ** attempt) + random.random() * self.backoff_s
+                log.warning("OpenAI request failed (%s), retry %s/%s in %.1fs", type(e).__name__, attempt, self.max_attempts - 1, delay)
+                await asyncio.sleep(delay)
+
+    async def chat_completion(self, **kwargs):
+        """
+        Rate-limited `client.chat.completions.create(**kwargs)`
+        """
+        response = await self.submit(
+            lambda: self.client.chat.completions.create(**kwargs),
+            token_estimate=estimate_tokens(kwargs.get("messages", []), kwargs.get("max_tokens"))
+        )
+
+        if self.save_path and not kwargs.get("stream"):
+            with open(self.save_path, "ab") as f:
+                f.write(orjson.dumps([kwargs, response.model_dump()]) + b"\n")
+
+        return response
+
+
+def estimate_tokens(messages: list, max_tokens: Optional[int] = None) -> int:
+    """
+    Rough token cost of a chat request: ~4 characters per prompt token plus
+    the requested completion budget.
+    """
+    prompt_chars = sum(len(m.get("content") or "") for m in messages)
+    return prompt_chars // 4 + (max_tokens or 0)
@@ -1,8 +1,57 @@
+import copy
 import json
-from typing import Dict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional
 import os
 
 
+@dataclass(frozen=True)
+class VoiceSummary:
+    """Brand voice fields pre-joined into the strings the agents' prompts embed"""
+    tone: str
+    pacing: str
+    sentence_length: int
+    signature_phrases: str
+    avoid_items: str
+    humor_types: str
+
+
+# Used when a channel has no brand profile (generic mode)
+GENERIC_VOICE = VoiceSummary(
+    tone="sarcastic, deadpan",
+    pacing="rapid-fire",
+    sentence_length=10,
+    signature_phrases="like and subscribe, it's actually pretty simple, but here's the thing",
+    avoid_items="lengthy explanations, overly formal language, excessive enthusiasm",
+    humor_types="programming memes, tech culture references"
+)
+
+
+def summarize_brand_voice(brand_voice: Optional[Dict]) -> VoiceSummary:
+    """
+    Extract the prompt-ready voice characteristics shared by the scout and
+    writer system prompts.
+
+    Args:
+        brand_voice: Brand voice profile dict (None for generic mode)
+
+    Returns:
+        VoiceSummary with list fields joined (top 3 phrases / avoid items)
+    """
+    if not brand_voice:
+        return GENERIC_VOICE
+
+    return VoiceSummary(
+        tone=", ".join(brand_voice.get("tone", ["sarcastic", "deadpan"])),
+        pacing=brand_voice.get("pacing", "rapid-fire"),
+        sentence_length=brand_voice.get("sentence_structure", {}).get("avg_length_words", 10),
+        signature_phrases=", ".join(brand_voice.get("signature_phrases", [])[:3]),
+        avoid_items=", ".join(brand_voice.get("avoid", [])[:3]),
+        humor_types=", ".join(brand_voice.get("humor_types", []))
+    )
+
+
 def load_brand_voice(channel_name: str, config_dir: str = None) -> Dict:
     """
     Load brand voice profile for any channel (flexible for multiple channels).
@@ -26,7 +75,22 @@ def load_brand_voice(channel_name: str, config_dir: str = None) -> Dict:
 
     # Convert channel name to filename (fireship -> fireship_brand_voice.json)
     filename = f"{channel_name.lower()}_brand_voice.json"
-    filepath = os.path.join(config_dir, filename)
+    # Absolute path, so "config" and "./config" share one cache entry
+    filepath = os.path.abspath(os.path.join(config_dir, filename))
+
+    # Callers get their own copy so the cached profile can't be mutated
+    return copy.deepcopy(_read_profile(filepath))
+
+
+@lru_cache(maxsize=32)
+def _read_profile(filepath: str) -> Dict:
+    """
+    Parse and validate a brand profile file, once per path.
+
+    Every agent in a workflow (scout, writer, validator) loads the same
+    profile; failures aren't cached, so a missing file is retried next call.
+    """
+    filename = os.path.basename(filepath)
 
     try:
         with open(filepath, 'r') as f:
@@ -3,18 +3,32 @@ HackerNews API scraper for fetching trending tech topics.
 Uses official HackerNews Firebase API: https://hacker-news.firebaseio.com/v0/
 """
 
-import requests
-from typing import List, Dict, Optional
+import asyncio
+import logging
+import httpx
 import time
+from typing import List, Dict, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+BASE_URL = "https://hacker-news.firebaseio.com/v0"
+
+# Story details by ID, reused across calls for ITEM_CACHE_TTL_S seconds; the
+# top-story list overlaps heavily between runs, scores drift slowly
+ITEM_CACHE_TTL_S = 600
+_ITEM_CACHE: Dict[int, Tuple[float, Dict]] = {}
 
 
 def get_trending_hn(limit: int = 10, timeout: int = 5) -> List[Dict]:
     """
     Fetch top trending stories from HackerNews.
 
+    Blocking wrapper around `get_trending_hn_async`; must not be called from
+    a running event loop (use the async variant there).
+
     Args:
         limit: Number of stories to fetch (default: 10)
-        timeout: Request timeout in seconds (default: 5)
+        timeout: Total time budget in seconds for all requests (default: 5)
 
     Returns:
         List of dicts with: {
@@ -27,7 +41,7 @@ def get_trending_hn(limit: int = 10, timeout: int = 5) -> List[Dict]:
         }
 
     Raises:
-        requests.RequestException: If API call fails
+        httpx.HTTPError: If API call fails
         TimeoutError: If request exceeds timeout
 
     Example:
@@ -35,56 +49,81 @@ def get_trending_hn(limit: int = 10, timeout: int = 5) -> List[Dict]:
         for story in trending:
             print(f"{story['title']} ({story['score']} points)")
     """
+    return asyncio.run(get_trending_hn_async(limit=limit, timeout=timeout))
+
 
-    base_url = "https://hacker-news.firebaseio.com/v0"
+async def get_trending_hn_async(limit: int = 10, timeout: int = 5) -> List[Dict]:
+    """
+    Async variant of `get_trending_hn`.
 
+    Story details are fetched concurrently over one HTTP/2 connection, so the
+    call costs about two round-trips regardless of `limit`.
+    """
     try:
-        # Get IDs of top stories
-        print(f"Fetching top {limit} HackerNews stories...")
-        top_stories_response = requests.get(
-            f"{base_url}/topstories.json",
-            timeout=timeout
-        )
-        top_stories_response.raise_for_status()
-        top_story_ids = top_stories_response.json()[:limit]
+        # One budget across the listing and every story request
+        return await asyncio.wait_for(_fetch_trending(limit, timeout), timeout)
 
-        # Fetch details for each story
-        stories = []
-        for story_id in top_story_ids:
-            try:
-                story_response = requests.get(
-                    f"{base_url}/item/{story_id}.json",
-                    timeout=timeout
-                )
-                story_response.raise_for_status()
-                story = story_response.json()
-
-                # Skip if story is deleted or has no title
-                if story is None or "title" not in story:
-                    continue
-
-                stories.append({
-                    "id": story.get("id"),
-                    "title": story.get("title"),
-                    "score": story.get("score", 0),
-                    "url": story.get("url", ""),
-                    "by": story.get("by", "unknown"),
-                    "time": story.get("time")
-                })
-
-                # Small delay to be respectful to the API
-                time.sleep(0.1)
-
-            except requests.RequestException as e:
-                print(f"Warning: Failed to fetch story {story_id}: {e}")
-                continue
-
-        print(f"Fetched {len(stories)} stories from HackerNews")
-        return stories
-
-    except requests.Timeout:
+    except (asyncio.TimeoutError, httpx.TimeoutException):
         raise TimeoutError(f"HackerNews API request timed out after {timeout} seconds")
-    except requests.RequestException as e:
-        raise requests.RequestException(f"Failed to fetch HackerNews data: {e}")
+    except httpx.HTTPError as e:
+        raise httpx.HTTPError(f"Failed to fetch HackerNews data: {e}")
     except Exception as e:
         raise Exception(f"Unexpected error fetching HackerNews: {e}")
+
+
+async def _fetch_trending(limit: int, timeout: float) -> List[Dict]:
+    """Fetch the top story IDs, then every story's details in parallel"""
+    async with httpx.AsyncClient(http2=True, timeout=timeout) as client:
+        # Get IDs of top stories
+        log.info("Fetching top %s HackerNews stories...", limit)
+        top_stories_response = await client.get(f"{BASE_URL}/topstories.json")
+        top_stories_response.raise_for_status()
+        top_story_ids = top_stories_response.json()[:limit]
+
+        # Drop expired entries so the cache only holds recent stories
+        now = time.monotonic()
+        for story_id, (fetched_at, _) in list(_ITEM_CACHE.items()):
+            if now - fetched_at > ITEM_CACHE_TTL_S:
+                _ITEM_CACHE.pop(story_id, None)
+
+        # Fetch details for each story (cached ones return immediately)
+        results = await asyncio.gather(
+            *[_fetch_story(client, story_id) for story_id in top_story_ids]
+        )
+
+    stories = [story for story in results if story is not None]
+    log.info("Fetched %s stories from HackerNews", len(stories))
+    return stories
+
+
+async def _fetch_story(client: httpx.AsyncClient, story_id: int) -> Optional[Dict]:
+    """Fetch one story, or None if it is deleted, untitled or fails to load"""
+    entry = _ITEM_CACHE.get(story_id)
+    if entry is not None and time.monotonic() - entry[0] <= ITEM_CACHE_TTL_S:
+        return dict(entry[1])  # Callers get their own copy
+
+    try:
+        story_response = await client.get(f"{BASE_URL}/item/{story_id}.json")
+        story_response.raise_for_status()
+        story = story_response.json()
+
+    # One slow or malformed item just drops that story; only the overall
+    # budget in get_trending_hn_async is fatal
+    except (httpx.HTTPError, ValueError) as e:
+        log.warning("Warning: Failed to fetch story %s: %s", story_id, e)
+        return None
+
+    # Skip if story is deleted or has no title
+    if story is None or "title" not in story:
+        return None
+
+    story = {
+        "id": story.get("id"),
+        "title": story.get("title"),
+        "score": story.get("score", 0),
+        "url": story.get("url", ""),
+        "by": story.get("by", "unknown"),
+        "time": story.get("time")
+    }
+    _ITEM_CACHE[story_id] = (time.monotonic(), story)
+    return story
@@ -0,0 +1,127 @@
+"""
+Content-addressed on-disk cache for LLM responses.
+
+Responses are stored in a local SQLite database keyed by a hash of the full
+request (model, messages, sampling params), so identical prompts resent
+across reruns or refinement iterations are answered without a network call.
+
+Entries can optionally carry an embedding so near-duplicate requests (e.g. a
+research brief that differs only in wording) can be matched by cosine
+similarity within a scope.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import List, Optional
+
+import numpy as np
+import orjson
+
+
+class LLMCache:
+    """
+    SQLite-backed key/value cache for completion text.
+
+    Usage:
+        cache = LLMCache(".cache/openai")
+        key = cache.make_key(model="gpt-4.1", messages=[...], temperature=0.8)
+        text = cache.get(key)
+        if text is None:
+            text = call_api(...)
+            cache.set(key, text)
+    """
+
+    def __init__(self, cache_dir: str = ".cache/openai"):
+        """
+        Args:
+            cache_dir: Directory holding the cache database (created if missing)
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, "responses.sqlite3")
+
+        # One connection shared across threads (asyncio.to_thread, Streamlit)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, scope TEXT NOT NULL, vector BLOB NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_scope ON embeddings (scope)"
+            )
+
+    @staticmethod
+    def make_key(**request) -> str:
+        """Stable hash of a request's parameters"""
+        payload = orjson.dumps(request, option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(payload, digest_size=32).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for `key`, or None on a miss"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str):
+        """Store `value` under `key`, replacing any previous entry"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    def set_embedding(self, key: str, scope: str, vector: List[float]):
+        """
+        Attach an embedding to the entry stored under `key`.
+
+        Args:
+            key: Key of an entry previously stored with `set`
+            scope: Only entries sharing a scope are compared in `get_similar`
+            vector: Embedding of the request (normalized before storing)
+        """
+        vec = np.asarray(vector, dtype=np.float32)
+        vec /= np.linalg.norm(vec) or 1.0
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (key, scope, vector) VALUES (?, ?, ?)",
+                (key, scope, vec.tobytes())
+            )
+
+    def get_similar(self, scope: str, vector: List[float], threshold: float) -> Optional[str]:
+        """
+        Return the value whose embedding is most similar to `vector`.
+
+        Args:
+            scope: Scope passed to `set_embedding`
+            vector: Embedding of the new request
+            threshold: Minimum cosine similarity for a hit
+
+        Returns:
+            Cached value of the nearest entry, or None if none is close enough
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT e.vector, r.value FROM embeddings e JOIN responses r ON r.key = e.key WHERE e.scope = ?",
+                (scope,)
+            ).fetchall()
+        if not rows:
+            return None
+
+        query = np.asarray(vector, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1.0
+        stored = np.stack([np.frombuffer(row[0], dtype=np.float32) for row in rows])
+        similarities = stored @ query
+        best = int(similarities.argmax())
+        return rows[best][1] if similarities[best] >= threshold else None
+
+    def clear(self):
+        """Drop all cached responses"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.execute("DELETE FROM embeddings")
@@ -0,0 +1,54 @@
+"""
+Process-wide logging setup for the CLI and Streamlit entry points.
+
+Agents log through `logging.getLogger(__name__)` under the `src` package.
+Servers (Streamlit) route those records through a QueueHandler so concurrent
+sessions never block on the stdout lock; a background QueueListener does the
+actual writes. The CLI writes synchronously so log lines stay in order with
+its own printed banners and results.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+_configured = False
+
+
+def configure_logging(level: int = logging.INFO, use_queue: bool = True):
+    """
+    Send `src.*` log records to stdout.
+
+    Safe to call repeatedly (e.g. on every Streamlit rerun); only the first
+    call installs handlers.
+
+    Args:
+        level: Minimum level to emit (INFO shows agent progress messages)
+        use_queue: Hand records to a background writer thread instead of
+            writing to stdout on the calling thread
+    """
+    global _configured
+    if _configured:
+        return
+    _configured = True
+
+    # Plain messages, so output reads like the agents' original progress prints
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    if use_queue:
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        listener.start()
+        # Flush queued records before the interpreter exits
+        atexit.register(listener.stop)
+        handler = logging.handlers.QueueHandler(log_queue)
+    else:
+        handler = stream_handler
+
+    logger = logging.getLogger("src")
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
@@ -1,33 +1,280 @@
+import asyncio
+import contextlib
+import httpx
+import logging
 import openai
+import orjson
 import os
-from typing import Optional, Type, TypeVar
+import tempfile
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, AsyncIterator, Coroutine, Dict, List, Optional, Tuple, Type, TypeVar, get_args
 from pydantic import BaseModel
+from src.utils.async_pool import RateLimitedClient, TokenBucket, estimate_tokens
+from src.utils.llm_cache import LLMCache
+
+log = logging.getLogger(__name__)
 
 T = TypeVar('T', bound=BaseModel)
+R = TypeVar('R')
+
+# Shared HTTP settings: HTTP/2 lets concurrent agent calls multiplex over one
+# connection instead of paying a TCP/TLS handshake per request
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Token counts for the current `track_usage` block; copied into tasks it starts
+_RUN_USAGE: ContextVar[Optional[Dict[str, int]]] = ContextVar("openai_run_usage", default=None)
+
+
+def _strict_schema(schema: Dict) -> Dict:
+    """
+    Make a pydantic JSON schema valid for strict structured outputs.
+
+    Strict mode requires every object to list all of its properties as
+    required and to forbid additional properties; nested models ($defs),
+    arrays and unions are handled recursively.
+    """
+    if schema.get("type") == "object" and "properties" in schema:
+        schema["additionalProperties"] = False
+        schema["required"] = list(schema["properties"])
+
+    # Strict mode rejects `default`; pydantic only emits it for optional fields
+    if schema.get("default", ...) is None:
+        del schema["default"]
+
+    for key in ("properties", "$defs"):
+        for subschema in schema.get(key, {}).values():
+            _strict_schema(subschema)
+    if isinstance(schema.get("items"), dict):
+        _strict_schema(schema["items"])
+    for key in ("anyOf", "allOf"):
+        for subschema in schema.get(key, []):
+            _strict_schema(subschema)
+
+    return schema
+
+
+@lru_cache(maxsize=None)
+def _response_format_param(response_format: Type[BaseModel]) -> Dict:
+    """
+    Strict json_schema response_format for a Pydantic model (built once per model).
+
+    Built from `model_json_schema()` here rather than with the SDK's private
+    `openai.lib._parsing` helpers, which can change in any release.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "schema": _strict_schema(response_format.model_json_schema()),
+            "name": response_format.__name__,
+            "strict": True
+        }
+    }
+
+
+def _contains_model(annotation) -> bool:
+    """Whether a field annotation is, or wraps (List[...], Optional[...]), a Pydantic model"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return True
+    return any(_contains_model(arg) for arg in get_args(annotation))
+
+
+@lru_cache(maxsize=None)
+def _is_flat(response_format: Type[BaseModel]) -> bool:
+    """Whether a model has no nested Pydantic models (safe for `model_construct`)"""
+    return not any(_contains_model(f.annotation) for f in response_format.model_fields.values())
+
+
+def _construct_structured(response, response_format: Type[T]) -> T:
+    """
+    Build the response model from a strict json_schema completion.
+
+    The API enforces the schema server-side, so the payload is trusted and
+    `model_construct` skips pydantic's field-by-field re-validation. It would
+    leave nested models as plain dicts, so models with nested models are
+    validated normally instead.
+    """
+    message = response.choices[0].message
+    if message.refusal:
+        raise ValueError(f"Model refused to respond: {message.refusal}")
+    return _parse_structured(message.content, response_format)
+
+
+def _parse_structured(content: str, response_format: Type[T]) -> T:
+    """Build the response model from schema-conforming JSON (API or cache)"""
+    if not _is_flat(response_format):
+        return response_format.model_validate_json(content)
+    return response_format.model_construct(**orjson.loads(content))
 
 class OpenAIClient:
     """
     OpenAI API wrapper with structured output support for reliability
     """
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_requests_per_minute: Optional[int] = None,
+        max_tokens_per_minute: Optional[int] = None,
+        cache: Optional[LLMCache] = None
+    ):
         # Use provided key, fallback to environment variable
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         self.client = openai.OpenAI(
-            api_key=api_key or os.getenv("OPENAI_API_KEY")
+            api_key=self.api_key,
+            http_client=httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
         )
-        
+
+        # Rate limits for async calls (see `pool`), fallback to environment
+        self.max_requests_per_minute = max_requests_per_minute or int(os.getenv("OPENAI_MAX_RPM", "500"))
+        self.max_tokens_per_minute = max_tokens_per_minute or int(os.getenv("OPENAI_MAX_TPM", "200000"))
+
+        # One RPM/TPM budget for every event loop using this client; the
+        # pools themselves are created lazily per loop (see `pool`)
+        self._request_bucket = TokenBucket(self.max_requests_per_minute)
+        self._token_bucket = TokenBucket(self.max_tokens_per_minute)
+        self._pools = weakref.WeakKeyDictionary()
+        self._pools_lock = threading.Lock()
+
+        # Optional on-disk response cache, opt-in via LLM_CACHE=1
+        if cache is None and os.getenv("LLM_CACHE") == "1":
+            cache = LLMCache(os.getenv("LLM_CACHE_DIR", ".cache/openai"))
+        self.cache = cache
+
+        # Lifetime prompt token usage, to monitor OpenAI's automatic prompt
+        # prefix caching (see `track_usage` for per-run counts)
+        self.usage = {"prompt_tokens": 0, "cached_tokens": 0}
+        self._usage_lock = threading.Lock()
+
         # Default model configs per agent type
         self.agent_models = {
             "scout": "gpt-4.1-mini",      # Fast, cheap research
             "writer": "gpt-4.1",           # Best quality for scripts
             "validator": "gpt-4.1-mini"    # Fast validation
         }
-        
+
         self.agent_temps = {
             "scout": 0.3,      # Factual
             "writer": 0.8,     # Creative
             "validator": 0.2   # Consistent
         }
-    
+
+    @property
+    def pool(self) -> RateLimitedClient:
+        """
+        Rate-limited AsyncOpenAI pool bound to the currently running event loop.
+
+        httpx connection pools and asyncio primitives cannot be shared across
+        event loops, so each loop (e.g. one `asyncio.run` per Streamlit
+        session) gets its own pool, reused for every call on that loop. All
+        pools draw from this client's shared RPM/TPM buckets.
+        """
+        loop = asyncio.get_running_loop()
+        with self._pools_lock:
+            pool = self._pools.get(loop)
+            if pool is None:
+                pool = RateLimitedClient(
+                    # Retries are handled by the pool
+                    openai.AsyncOpenAI(
+                        api_key=self.api_key,
+                        max_retries=0,
+                        http_client=httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+                    ),
+                    save_path=os.getenv("OPENAI_RESULTS_PATH"),
+                    request_bucket=self._request_bucket,
+                    token_bucket=self._token_bucket
+                )
+                self._pools[loop] = pool
+        return pool
+
+    async def aclose(self):
+        """
+        Close the running event loop's pool and its HTTP connections.
+
+        Call before the loop ends; the next async call on a new loop builds a
+        fresh pool.
+        """
+        with self._pools_lock:
+            pool = self._pools.pop(asyncio.get_running_loop(), None)
+        if pool is not None:
+            await pool.client.close()
+
+    def run(self, coro: Coroutine[Any, Any, R]) -> R:
+        """
+        `asyncio.run(coro)`, closing this client's pool for that loop afterwards.
+
+        Use for one-off event loops (a CLI run, a Streamlit click) so their
+        HTTP connections are released when the loop ends instead of leaking.
+        """
+        async def main():
+            try:
+                return await coro
+            finally:
+                await self.aclose()
+
+        return asyncio.run(main())
+
+    @property
+    def aclient(self) -> openai.AsyncOpenAI:
+        """AsyncOpenAI client for the running event loop (bypasses rate limiting)"""
+        return self.pool.client
+
+    def _resolve_config(
+        self,
+        agent_type: str,
+        model: Optional[str],
+        temperature: Optional[float]
+    ) -> Tuple[str, float]:
+        """Fill in per-agent model/temperature defaults"""
+        model = model or self.agent_models.get(agent_type, "gpt-4.1-mini")
+        temperature = temperature or self.agent_temps.get(agent_type, 0.7)
+        return model, temperature
+
+    @contextlib.contextmanager
+    def track_usage(self):
+        """
+        Count prompt tokens used by calls made inside the block.
+
+        Tasks started inside the block (e.g. LangGraph nodes) inherit the
+        counter, so concurrent runs sharing this client each get their own.
+
+        Yields:
+            Dict with "prompt_tokens" and "cached_tokens", updated in place
+        """
+        usage = {"prompt_tokens": 0, "cached_tokens": 0}
+        token = _RUN_USAGE.set(usage)
+        try:
+            yield usage
+        finally:
+            _RUN_USAGE.reset(token)
+
+    def _record_usage(self, response):
+        """Accumulate prompt / cached-prompt token counts from a response"""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        prompt_tokens = usage.prompt_tokens or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = (details.cached_tokens or 0) if details is not None else 0
+
+        with self._usage_lock:
+            for counts in (self.usage, _RUN_USAGE.get()):
+                if counts is not None:
+                    counts["prompt_tokens"] += prompt_tokens
+                    counts["cached_tokens"] += cached_tokens
+
+    @staticmethod
+    def _cache_routing(prompt_cache_key: Optional[str]) -> Optional[Dict]:
+        """Request body extras routing calls with a shared prefix to one prompt cache"""
+        return {"prompt_cache_key": prompt_cache_key} if prompt_cache_key else None
+
+    def _cache_key(self, **request) -> Optional[str]:
+        """Cache key for a request, or None when caching is disabled"""
+        return self.cache.make_key(**request) if self.cache else None
+
     def call_agent(
         self,
         agent_type: str,
@@ -35,31 +282,136 @@ class OpenAIClient:
         user_message: str,
         model: Optional[str] = None,
         temperature: Optional[float] = None,
-        max_tokens: int = 2048
+        max_tokens: int = 2048,
+        prompt_cache_key: Optional[str] = None
     ) -> str:
         """
         Standard text completion for open-ended responses
+
+        `prompt_cache_key` works as in `call_agent_structured`.
         """
-        model = model or self.agent_models.get(agent_type, "gpt-4.1-mini")
-        temperature = temperature or self.agent_temps.get(agent_type, 0.7)
-        
+        model, temperature = self._resolve_config(agent_type, model, temperature)
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+
+        key = self._cache_key(model=model, messages=messages, temperature=temperature, max_tokens=max_tokens)
+        if key and (cached := self.cache.get(key)) is not None:
+            return cached
+
         try:
             response = self.client.chat.completions.create(
                 model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message}
-                ],
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                extra_body=self._cache_routing(prompt_cache_key)
+            )
+
+            self._record_usage(response)
+            content = response.choices[0].message.content
+            if key and content is not None:
+                self.cache.set(key, content)
+            return content
+
+        except Exception as e:
+            log.error("OpenAI API error for %s: %s", agent_type, e)
+            raise
+
+    async def acall_agent(
+        self,
+        agent_type: str,
+        system_prompt: str,
+        user_message: str,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: int = 2048,
+        prompt_cache_key: Optional[str] = None
+    ) -> str:
+        """
+        Async variant of `call_agent` so independent calls can run concurrently
+        """
+        model, temperature = self._resolve_config(agent_type, model, temperature)
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+
+        key = self._cache_key(model=model, messages=messages, temperature=temperature, max_tokens=max_tokens)
+        if key and (cached := self.cache.get(key)) is not None:
+            return cached
+
+        try:
+            response = await self.pool.chat_completion(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                extra_body=self._cache_routing(prompt_cache_key)
+            )
+
+            self._record_usage(response)
+            content = response.choices[0].message.content
+            if key and content is not None:
+                self.cache.set(key, content)
+            return content
+
+        except Exception as e:
+            log.error("OpenAI API error for %s: %s", agent_type, e)
+            raise
+
+    async def astream_agent(
+        self,
+        agent_type: str,
+        system_prompt: str,
+        user_message: str,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: int = 2048,
+        prompt_cache_key: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Streaming variant of `acall_agent`, yielding text deltas as they arrive
+        """
+        model, temperature = self._resolve_config(agent_type, model, temperature)
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+
+        # Shares cache entries with `acall_agent`; a hit is yielded in one piece
+        key = self._cache_key(model=model, messages=messages, temperature=temperature, max_tokens=max_tokens)
+        if key and (cached := self.cache.get(key)) is not None:
+            yield cached
+            return
+
+        try:
+            stream = await self.pool.chat_completion(
+                model=model,
+                messages=messages,
                 temperature=temperature,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                extra_body=self._cache_routing(prompt_cache_key),
+                stream=True,
+                stream_options={"include_usage": True}  # Final chunk carries usage
             )
-            
-            return response.choices[0].message.content
-        
+
+            parts = []
+            async for chunk in stream:
+                if chunk.usage:
+                    self._record_usage(chunk)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield chunk.choices[0].delta.content
+
+            if key:
+                self.cache.set(key, "".join(parts))
+
         except Exception as e:
-            print(f"OpenAI API error for {agent_type}: {e}")
+            log.error("OpenAI API error for %s: %s", agent_type, e)
             raise
-    
+
     def call_agent_structured(
         self,
         agent_type: str,
@@ -67,28 +419,240 @@ class OpenAIClient:
         user_message: str,
         response_format: Type[T],
         model: Optional[str] = None,
-        temperature: Optional[float] = None
+        temperature: Optional[float] = None,
+        prompt_cache_key: Optional[str] = None
     ) -> T:
         """
-        Structured output with Pydantic schema 
+        Structured output with Pydantic schema
+
+        Pass a stable `prompt_cache_key` (e.g. per agent and channel) when the
+        system prompt is static, so OpenAI routes the calls to the same prompt
+        cache and bills the shared prefix at the cached-token rate.
         """
-        model = model or self.agent_models.get(agent_type, "gpt-4.1-mini")
-        temperature = temperature or self.agent_temps.get(agent_type, 0.7)
-        
+        model, temperature = self._resolve_config(agent_type, model, temperature)
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+
+        # The schema is part of the key, so a changed response model misses
+        key = self._cache_key(
+            model=model, messages=messages, temperature=temperature,
+            response_format=_response_format_param(response_format)
+        )
+        if key and (cached := self.cache.get(key)) is not None:
+            return _parse_structured(cached, response_format)
+
         try:
-            response = self.client.beta.chat.completions.parse(
+            response = self.client.chat.completions.create(
                 model=model,
-                messages=[
+                messages=messages,
+                response_format=_response_format_param(response_format),
+                temperature=temperature,
+                extra_body=self._cache_routing(prompt_cache_key)
+            )
+
+            self._record_usage(response)
+
+            # Returns typed Pydantic object, not string
+            result = _construct_structured(response, response_format)
+            if key:
+                self.cache.set(key, response.choices[0].message.content)
+            return result
+
+        except Exception as e:
+            log.error("Structured output failed for %s: %s", agent_type, e)
+            raise
+
+    async def acall_agent_structured(
+        self,
+        agent_type: str,
+        system_prompt: str,
+        user_message: str,
+        response_format: Type[T],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        prompt_cache_key: Optional[str] = None
+    ) -> T:
+        """
+        Async variant of `call_agent_structured`
+        """
+        model, temperature = self._resolve_config(agent_type, model, temperature)
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_message}
+        ]
+
+        key = self._cache_key(
+            model=model, messages=messages, temperature=temperature,
+            response_format=_response_format_param(response_format)
+        )
+        if key and (cached := self.cache.get(key)) is not None:
+            return _parse_structured(cached, response_format)
+
+        try:
+            response = await self.pool.submit(
+                lambda: self.aclient.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    response_format=_response_format_param(response_format),
+                    temperature=temperature,
+                    extra_body=self._cache_routing(prompt_cache_key)
+                ),
+                token_estimate=estimate_tokens(messages, max_tokens=1024)
+            )
+
+            self._record_usage(response)
+            result = _construct_structured(response, response_format)
+            if key:
+                self.cache.set(key, response.choices[0].message.content)
+            return result
+
+        except Exception as e:
+            log.error("Structured output failed for %s: %s", agent_type, e)
+            raise
+
+    def embed(self, text: str, model: str = "text-embedding-3-small") -> List[float]:
+        """
+        Embedding vector for `text` (used for semantic cache lookups)
+        """
+        try:
+            response = self.client.embeddings.create(model=model, input=text)
+            return response.data[0].embedding
+
+        except Exception as e:
+            log.error("Embedding request failed: %s", e)
+            raise
+
+    async def aembed(self, text: str, model: str = "text-embedding-3-small") -> List[float]:
+        """
+        Async, rate-limited variant of `embed`
+        """
+        try:
+            response = await self.pool.submit(
+                lambda: self.aclient.embeddings.create(model=model, input=text),
+                token_estimate=len(text) // 4
+            )
+            return response.data[0].embedding
+
+        except Exception as e:
+            log.error("Embedding request failed: %s", e)
+            raise
+
+    def build_batch_request(
+        self,
+        custom_id: str,
+        agent_type: str,
+        system_prompt: str,
+        user_message: str,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: int = 2048
+    ) -> Dict:
+        """
+        Build one Batch API request line equivalent to a `call_agent` call
+        """
+        model, temperature = self._resolve_config(agent_type, model, temperature)
+
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": [
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_message}
                 ],
-                response_format=response_format,
-                temperature=temperature
+                "temperature": temperature,
+                "max_tokens": max_tokens
+            }
+        }
+
+    def submit_batch(self, requests: List[Dict]) -> str:
+        """
+        Submit chat completion requests through the Batch API.
+
+        Batch jobs are billed at ~50% of the synchronous price but complete
+        asynchronously (within 24h), so use them for non-interactive runs only.
+
+        Args:
+            requests: Request lines, e.g. from `build_batch_request`
+
+        Returns:
+            Batch ID to pass to `poll_batch`
+        """
+        with tempfile.NamedTemporaryFile("wb", suffix=".jsonl", delete=False) as f:
+            f.write(b"".join(orjson.dumps(request) + b"\n" for request in requests))
+            batch_path = f.name
+
+        try:
+            with open(batch_path, "rb") as f:
+                batch_file = self.client.files.create(file=f, purpose="batch")
+
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
             )
-            
-            # Returns typed Pydantic object, not string
-            return response.choices[0].message.parsed
-        
+            return batch.id
+
         except Exception as e:
-            print(f"Structured output failed for {agent_type}: {e}")
+            log.error("Batch submission failed: %s", e)
             raise
+
+        finally:
+            os.remove(batch_path)
+
+    def poll_batch(
+        self,
+        batch_id: str,
+        initial_delay: float = 5.0,
+        max_delay: float = 300.0,
+        timeout: Optional[float] = None
+    ) -> Dict[str, str]:
+        """
+        Wait for a batch to finish, backing off exponentially between polls.
+
+        Args:
+            batch_id: ID returned by `submit_batch`
+            initial_delay: Seconds before the first re-poll
+            max_delay: Upper bound for the poll interval
+            timeout: Give up after this many seconds (None = wait forever)
+
+        Returns:
+            Dict mapping custom_id -> completion text
+
+        Raises:
+            TimeoutError: If the batch is still running after `timeout`
+            RuntimeError: If the batch failed, expired or was cancelled
+        """
+        delay = initial_delay
+        started = time.monotonic()
+
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise RuntimeError(f"Batch {batch_id} ended with status '{batch.status}'")
+            if timeout is not None and time.monotonic() - started > timeout:
+                raise TimeoutError(f"Batch {batch_id} still '{batch.status}' after {timeout} seconds")
+
+            time.sleep(delay)
+            delay = min(delay * 2, max_delay)
+
+        results = {}
+        output = self.client.files.content(batch.output_file_id)
+        for line in output.content.splitlines():
+            if not line.strip():
+                continue
+            item = orjson.loads(line)
+            if item.get("error"):
+                log.warning("Batch request %s failed: %s", item['custom_id'], item['error'])
+                continue
+            body = item["response"]["body"]
+            results[item["custom_id"]] = body["choices"][0]["message"]["content"]
+
+        return results